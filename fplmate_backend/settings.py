@@ -53,9 +53,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'models.middleware.MetricsMiddleware',  # Per-route latency, Server-Timing and opt-in profiling
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # Make sure it's here
+    'models.middleware.AsyncWhiteNoiseMiddleware',  # WhiteNoise, async capable for the ASGI views
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     # 'django.middleware.csrf.CsrfViewMiddleware',
@@ -151,7 +152,41 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'  # Where collected static files will be s
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 
+# Prepared season data cache used by the recommender
+# BACKEND is 'lru' (in-process) or 'django' (uses CACHES[ALIAS], e.g. locmem or file based).
+# Besides the prepared seasons it holds the indexes derived from them (history,
+# candidates, similarity, simulation), so it needs room for all of those
+SEASON_DATA_CACHE = {
+    'BACKEND': 'lru',
+    'MAX_ENTRIES': 8,
+}
+
+
+# Worker threads for the async/ views (pandas and optimizer work is offloaded to them)
+ASYNC_WORKERS = int(os.environ.get('ASYNC_WORKERS', 4))
+
+
+# Trained model artifacts (see models/registry.py)
+# MODEL_MMAP_MODE='r' memory-maps large arrays so forked workers share them;
+# MODEL_WARMUP_ON_STARTUP loads every artifact when Django starts (e.g. with gunicorn --preload)
+MODEL_MMAP_MODE = os.environ.get('MODEL_MMAP_MODE') or None
+MODEL_WARMUP_ON_STARTUP = os.environ.get('MODEL_WARMUP_ON_STARTUP', '') == '1'
+
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Request instrumentation (see models/metrics.py); metrics are served at /metrics.
+# With PROFILE_REQUESTS=1, a request whose X-Profile header matches PROFILE_SECRET
+# is run under cProfile and its stats are written to PROFILE_DIR. Off by default,
+# and never on without a secret
+PROFILE_REQUESTS = os.environ.get('PROFILE_REQUESTS') == '1'
+PROFILE_SECRET = os.environ.get('PROFILE_SECRET', '')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(BASE_DIR, 'profiles'))
+
+
+# Refresh season data by parsing only newly appended gameweek rows (state in data/compiled/)
+INCREMENTAL_INGEST = os.environ.get('INCREMENTAL_INGEST', '1') == '1'
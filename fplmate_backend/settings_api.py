@@ -0,0 +1,32 @@
+"""
+Lean settings for stateless API workers (e.g. the Vercel lambda).
+
+Only the prediction and recommendation endpoints are routed (see urls_api.py).
+Admin, auth, sessions, messages, contenttypes and the sqlite database are
+left out, and every view module is imported on its first request, so pandas,
+sklearn and joblib are not loaded while the worker starts.
+
+Select it with DJANGO_SETTINGS_MODULE=fplmate_backend.settings_api.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    'models',
+    'corsheaders',
+]
+
+MIDDLEWARE = [
+    'models.middleware.MetricsMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+ROOT_URLCONF = 'fplmate_backend.urls_api'
+
+# No templates are rendered and no database is touched
+TEMPLATES = []
+DATABASES = {}
+AUTH_PASSWORD_VALIDATORS = []
+USE_I18N = False
@@ -19,15 +19,42 @@ from django.urls import path
 from django.urls import path, re_path
 from django.shortcuts import redirect
 from .hello import hello
-from models.views import predict_rating
-from models.recomender import RecommendTeamView
+from models.views import model_status, predict_rating, predict_ratings_batch
+from models.recomender import RecommendTeamView, SeasonCacheStatsView
+from models.candidates import RecommendTeamQueryView
+from models.similarity import SimilarPlayersView
+from models.names import PlayerAutocompleteView, PlayerSearchView
+from models.projections import PlayerProjectionView, ProjectionsView
+from models.planner import plan_transfers
+from models.simulation import simulate_squad
+from models.metrics import metrics
+from models.history import HistoryCareerView, HistoryPlayersView, HistoryPredictionsView
+from models.async_views import predict_rating_async, predict_ratings_batch_async, recommend_team_async
 from .basedir import BaseDirectoryView
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('landing',hello,name='hello'),
     # path('scrape', scrape),  # Endpoint to scrape a page
     path('predict-rating', predict_rating),  # Endpoint to predict player rating
+    path('predict-ratings/batch', predict_ratings_batch),  # Endpoint to rate many players at once
+    path('model-status', model_status),  # Load state, size and load time of trained artifacts
     path('recommend-team', RecommendTeamView.as_view(), name='recommend_team'),
+    path('recommend-team/query', RecommendTeamQueryView.as_view(), name='recommend_team_query'),  # Budget, locks, formation, team cap
+    path('players/autocomplete', PlayerAutocompleteView.as_view(), name='player_autocomplete'),  # Name prefix lookup
+    path('players/search', PlayerSearchView.as_view(), name='player_search'),  # Typo-tolerant name lookup
+    path('players/<int:player_id>/similar', SimilarPlayersView.as_view(), name='similar_players'),  # Nearest players by stats
+    path('projections', ProjectionsView.as_view(), name='projections'),
+    path('projections/<int:player_id>', PlayerProjectionView.as_view(), name='player_projection'),
+    path('async/predict-rating', predict_rating_async),  # Same endpoints, served off the event loop on ASGI
+    path('async/predict-ratings/batch', predict_ratings_batch_async),
+    path('async/recommend-team', recommend_team_async),
+    path('plan-transfers', plan_transfers),  # Multi-gameweek transfer plan for a squad
+    path('simulate-squad', simulate_squad),  # Monte Carlo points distribution for a squad
+    path('history/players', HistoryPlayersView.as_view(), name='history_players'),  # 2020-21 onwards, from data/
+    path('history/players/<int:history_id>', HistoryCareerView.as_view(), name='history_career'),
+    path('history/predictions', HistoryPredictionsView.as_view(), name='history_predictions'),
+    path('metrics', metrics),  # Prometheus text format
+    path('cache-stats', SeasonCacheStatsView.as_view(), name='cache_stats'),
     path('base-dir/', BaseDirectoryView.as_view(), name='base_directory'),
     re_path(r'^.*$', lambda request: redirect('/landing'))  # Catch-all redirect
 ]
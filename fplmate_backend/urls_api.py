@@ -0,0 +1,36 @@
+"""
+URL configuration for the lean API profile (settings_api.py).
+
+Views are referenced by dotted path and imported on their first request, so
+routing is ready without loading pandas, sklearn or joblib.
+"""
+from django.urls import path
+from django.utils.module_loading import import_string
+
+
+def lazy_view(dotted_path):
+    """Sync view that imports ``dotted_path`` (a function or View class) when first called."""
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            target = import_string(dotted_path)
+            view = target.as_view() if isinstance(target, type) else target
+        return view(request, *args, **kwargs)
+
+    wrapper.__name__ = dotted_path.rsplit('.', 1)[1]
+    return wrapper
+
+
+urlpatterns = [
+    path('predict-rating', lazy_view('models.views.predict_rating')),
+    path('predict-ratings/batch', lazy_view('models.views.predict_ratings_batch')),
+    path('model-status', lazy_view('models.views.model_status')),
+    path('recommend-team', lazy_view('models.recomender.RecommendTeamView'), name='recommend_team'),
+    path('recommend-team/query', lazy_view('models.candidates.RecommendTeamQueryView'), name='recommend_team_query'),
+    path('players/autocomplete', lazy_view('models.names.PlayerAutocompleteView'), name='player_autocomplete'),
+    path('players/search', lazy_view('models.names.PlayerSearchView'), name='player_search'),
+    path('metrics', lazy_view('models.metrics.metrics')),
+    path('cache-stats', lazy_view('models.recomender.SeasonCacheStatsView'), name='cache_stats'),
+]
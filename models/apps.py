@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ModelsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'models'
+
+    def ready(self):
+        from django.conf import settings
+
+        # Optionally load trained artifacts at startup instead of on the first request
+        if getattr(settings, 'MODEL_WARMUP_ON_STARTUP', False):
+            from .registry import registry
+            registry.warm_up()
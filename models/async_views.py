@@ -0,0 +1,109 @@
+import asyncio
+import contextvars
+import functools
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+
+from .metrics import add_spans, finish_request, start_request
+from .recomender import SquadIncompleteError, parse_recommend_params
+from .snapshots import get_recommend_snapshot
+from .views import predict_rating, predict_ratings_batch
+
+logger = logging.getLogger(__name__)
+
+# Blocking pandas / optimizer work runs on this bounded pool, never on the event loop
+ASYNC_WORKERS = getattr(settings, 'ASYNC_WORKERS', 4)
+executor = ThreadPoolExecutor(max_workers=ASYNC_WORKERS, thread_name_prefix='fplmate')
+
+# Computations currently running, keyed by their inputs
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def _run_with_spans(fn, *args):
+    """Run ``fn(*args)`` collecting its stage spans; returns (result, spans)."""
+    spans, token = start_request()
+    try:
+        return fn(*args), spans
+    finally:
+        finish_request(token)
+
+
+def submit_coalesced(key, fn, *args):
+    """Submit ``fn(*args)`` to the pool unless an identical call is already running.
+
+    Callers with the same key share one concurrent.futures.Future, which works
+    across event loops (ASGI) as well as per-request loops (async views under WSGI).
+    The future resolves to (result, spans) so every caller can report the
+    stages of the run they shared.
+    """
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        if future is None:
+            future = executor.submit(_run_with_spans, fn, *args)
+            _in_flight[key] = future
+            future.add_done_callback(lambda done: _finish(key, done))
+        return future
+
+
+def _finish(key, future):
+    with _in_flight_lock:
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+
+
+async def run_coalesced(key, fn, *args):
+    result, spans = await asyncio.wrap_future(submit_coalesced(key, fn, *args))
+    add_spans(spans)
+    return result
+
+
+async def run_in_pool(fn, *args):
+    # run_in_executor does not carry context variables over; copy them so spans reach this request
+    call = functools.partial(contextvars.copy_context().run, fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+
+async def _stream_payload(payload):
+    """Yield the recommendation JSON piece by piece, one squad row per chunk."""
+    yield '{"team": ['
+    for i, row in enumerate(payload['team']):
+        yield (', ' if i else '') + json.dumps(row, cls=DjangoJSONEncoder)
+    rest = {key: value for key, value in payload.items() if key != 'team'}
+    yield '], ' + json.dumps(rest, cls=DjangoJSONEncoder)[1:]
+
+
+async def recommend_team_async(request):
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Only GET method is allowed'}, status=405)
+    try:
+        engine, deadline, risk = parse_recommend_params(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    try:
+        # Identical concurrent requests share one computation
+        snapshot = await run_coalesced(('recommend-team', engine, deadline, risk), get_recommend_snapshot,
+                                       engine, deadline, risk)
+    except SquadIncompleteError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        logger.exception('async/recommend-team failed')
+        return JsonResponse({'error': str(e)}, status=500)
+
+    if request.GET.get('stream') == '1':
+        return StreamingHttpResponse(_stream_payload(snapshot.payload), content_type='application/json')
+    return snapshot.response(request)
+
+
+async def predict_rating_async(request):
+    return await run_in_pool(predict_rating, request)
+
+
+async def predict_ratings_batch_async(request):
+    return await run_in_pool(predict_ratings_batch, request)
@@ -0,0 +1,145 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+
+from .optimizer import OPTIMIZER_ENGINES, optimize_team
+from .recomender import (MAX_PLAYERS_PER_TEAM, MAX_SPEND, SEASONS_DIR, TEAM_STRUCTURE, load_season_data,
+                         prepare_latest_data, select_best_team)
+
+# Worker processes for backtest; 1 runs everything in this process
+BACKTEST_WORKERS = getattr(settings, 'BACKTEST_WORKERS', os.cpu_count() or 1)
+
+# First gameweek picked for; earlier rounds only provide history
+START_GAMEWEEK = 2
+
+
+def greedy_strategy(latest_data):
+    """The recommender's points-per-value picker, as served by /recommend-team."""
+    return select_best_team(TEAM_STRUCTURE, MAX_PLAYERS_PER_TEAM, MAX_SPEND, latest_data)
+
+
+def _engine_strategy(engine):
+    def strategy(latest_data):
+        team_df, _ = optimize_team(latest_data, TEAM_STRUCTURE, MAX_PLAYERS_PER_TEAM, MAX_SPEND, engine)
+        return team_df
+    strategy.__doc__ = f'The {engine} optimizer engine on average_total_points.'
+    return strategy
+
+
+# Strategies take the prepared data known before a gameweek and return the
+# picked squad (rows with id and value). Workers look strategies up here by
+# name, so custom ones must be registered at import time to reach them.
+STRATEGIES = {'greedy': greedy_strategy}
+STRATEGIES.update({engine: _engine_strategy(engine) for engine in OPTIMIZER_ENGINES if engine != 'greedy'})
+
+
+def backtest_seasons(seasons_dir=None):
+    """Seasons with a gameweek tree (a players/ directory) under SEASONS_DIR, oldest first."""
+    seasons_dir = seasons_dir or SEASONS_DIR
+    if not os.path.isdir(seasons_dir):
+        return []
+    return sorted(entry.name for entry in os.scandir(seasons_dir)
+                  if os.path.isdir(os.path.join(entry.path, 'players')))
+
+
+# Season frames of the current backtest, set in each worker by _init_worker
+_season_data = {}
+
+
+def _init_worker(season_data):
+    _season_data.clear()
+    _season_data.update(season_data)
+
+
+def run_gameweek(season, gameweek, strategy_names):
+    """Pick with each strategy from the rounds before ``gameweek`` and score the picks on it.
+
+    The prepared data is built once and shared by every strategy. Picked
+    players without a row in the gameweek score nothing.
+    """
+    all_data = _season_data[season]
+    history = all_data[all_data['round'] < gameweek]
+    latest_data = prepare_latest_data(history)
+    realized = all_data[all_data['round'] == gameweek].groupby('id')['total_points'].sum()
+
+    results = []
+    for name in strategy_names:
+        start = time.perf_counter()
+        team_df = STRATEGIES[name](latest_data)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        ids = team_df['id'].tolist() if not team_df.empty else []
+        results.append({
+            'strategy': name,
+            'season': season,
+            'gameweek': int(gameweek),
+            'points': int(realized.reindex(ids).fillna(0).sum()),
+            'expected_points': round(float(team_df['average_total_points'].sum()), 2) if ids else 0.0,
+            'spend': int(team_df['value'].sum()) if ids else 0,
+            'players': len(ids),
+            'elapsed_ms': round(elapsed_ms, 2),
+        })
+    return results
+
+
+def _run_task(task):
+    return run_gameweek(*task)
+
+
+def _summarize(rows):
+    points = [row['points'] for row in rows]
+    return {
+        'gameweeks': len(rows),
+        'points': sum(points),
+        'mean_points': round(sum(points) / len(points), 2) if points else 0.0,
+        'expected_points': round(sum(row['expected_points'] for row in rows), 2),
+        'mean_ms': round(sum(row['elapsed_ms'] for row in rows) / len(rows), 2) if rows else 0.0,
+    }
+
+
+def run_backtest(seasons=None, strategies=None, workers=None, start_gameweek=START_GAMEWEEK):
+    """Replay seasons gameweek by gameweek and report each strategy's realized points.
+
+    Every (season, gameweek) runs as one task on a process pool, each worker
+    holding the season frames it was started with. Returns the report with
+    totals per strategy, per strategy and season, and per gameweek rows.
+    """
+    started = time.perf_counter()
+    seasons = seasons or backtest_seasons()
+    strategies = strategies or list(STRATEGIES)
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        raise ValueError(f'Unknown strategies {unknown}, expected some of {sorted(STRATEGIES)}')
+    workers = workers or BACKTEST_WORKERS
+
+    season_data = {season: load_season_data(season) for season in seasons}
+    loaded = time.perf_counter()
+    tasks = [(season, gameweek, strategies)
+             for season, all_data in season_data.items()
+             for gameweek in sorted(all_data['round'].unique()) if gameweek >= start_gameweek]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(season_data,)) as pool:
+            results = list(pool.map(_run_task, tasks, chunksize=max(len(tasks) // (workers * 4), 1)))
+    else:
+        _init_worker(season_data)
+        results = [_run_task(task) for task in tasks]
+    rows = [row for task_rows in results for row in task_rows]
+
+    report = {
+        'seasons': seasons,
+        'strategies': strategies,
+        'workers': workers,
+        'load_s': round(loaded - started, 2),
+        'elapsed_s': 0.0,
+        'summary': {},
+        'by_season': {},
+        'gameweeks': rows,
+    }
+    for name in strategies:
+        strategy_rows = [row for row in rows if row['strategy'] == name]
+        report['summary'][name] = _summarize(strategy_rows)
+        report['by_season'][name] = {season: _summarize([row for row in strategy_rows if row['season'] == season])
+                                     for season in seasons}
+    report['elapsed_s'] = round(time.perf_counter() - started, 2)
+    return report
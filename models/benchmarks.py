@@ -0,0 +1,217 @@
+import contextlib
+import io
+import json
+import os
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import RequestFactory
+
+from .recomender import (MAX_PLAYERS_PER_TEAM, MAX_SPEND, TEAM_STRUCTURE, clean_column_names,
+                         load_player_data, prepare_latest_data, select_best_team)
+from .optimizer import optimize_team
+from .registry import registry
+from .scoring import score_points
+from .store import load_season_store, save_season_store
+from .views import expected_features, predict_rating, rate_players
+
+# Size of a real season, multiplied by the benchmark scale
+REAL_PLAYERS = 700
+REAL_GAMEWEEKS = 38
+TEAMS = 20
+
+# Single-request predict_rating calls are capped so large scales stay quick
+MAX_SINGLE_PREDICTIONS = 300
+
+
+def write_synthetic_season(root, players=REAL_PLAYERS, gameweeks=REAL_GAMEWEEKS, seed=0):
+    """Write a synthetic season in the Fantasy-Premier-League layout under ``root``.
+
+    Creates ``players/<first>_<second>_<id>/gw.csv``, ``players_raw.csv`` and
+    ``teams.csv`` with the columns the recommender reads.
+    """
+    rng = np.random.default_rng(seed)
+    players_dir = os.path.join(root, 'players')
+    os.makedirs(players_dir, exist_ok=True)
+
+    ids = np.arange(1, players + 1)
+    element_type = rng.choice([1, 2, 2, 3, 3, 3, 4], size=players)
+    element_type[:4] = [1, 2, 3, 4]
+    team = rng.integers(1, TEAMS + 1, size=players)
+    now_cost = rng.integers(40, 131, size=players)
+
+    raw = pd.DataFrame({
+        'id': ids,
+        'first_name': [f'First{i}' for i in ids],
+        'second_name': [f'Second{i}' for i in ids],
+        'web_name': [f'Player{i}' for i in ids],
+        'element_type': element_type,
+        'team': team,
+        'now_cost': now_cost,
+        'minutes': rng.integers(0, 3420, size=players),
+        'goals_scored': rng.integers(0, 25, size=players),
+        'assists': rng.integers(0, 15, size=players),
+        'clean_sheets': rng.integers(0, 15, size=players),
+        'yellow_cards': rng.integers(0, 10, size=players),
+        'red_cards': rng.integers(0, 2, size=players),
+        'bonus': rng.integers(0, 30, size=players),
+        'saves': np.where(element_type == 1, rng.integers(0, 120, size=players), 0),
+        'total_points': rng.integers(0, 250, size=players),
+    })
+    raw.to_csv(os.path.join(root, 'players_raw.csv'), index=False)
+    pd.DataFrame({'id': np.arange(1, TEAMS + 1), 'name': [f'Team {i}' for i in range(1, TEAMS + 1)]}).to_csv(
+        os.path.join(root, 'teams.csv'), index=False)
+
+    rounds = np.arange(1, gameweeks + 1)
+    for player_id, cost in zip(ids, now_cost):
+        minutes = rng.choice([0, 0, 20, 60, 90, 90, 90], size=gameweeks)
+        played = minutes > 0
+        gw = pd.DataFrame({
+            'assists': rng.binomial(1, 0.1, size=gameweeks) * played,
+            'clean_sheets': rng.binomial(1, 0.3, size=gameweeks) * (minutes >= 60),
+            'element': player_id,
+            'expected_goal_involvements': np.round(rng.random(gameweeks) * played, 2),
+            'expected_goals_conceded': np.round(rng.random(gameweeks) * 2.5 * played, 2),
+            'goals_conceded': rng.integers(0, 4, size=gameweeks) * played,
+            'goals_scored': rng.binomial(1, 0.12, size=gameweeks) * played,
+            'minutes': minutes,
+            'round': rounds,
+            'selected': rng.integers(100, 3_000_000, size=gameweeks),
+            'starts': (minutes >= 60).astype(int),
+            'threat': np.round(rng.random(gameweeks) * 60, 1),
+            'total_points': rng.integers(-1, 16, size=gameweeks) * played,
+            'value': cost,
+            'was_home': rng.random(gameweeks) > 0.5,
+        })
+        folder = os.path.join(players_dir, f'First{player_id}_Second{player_id}_{player_id}')
+        os.makedirs(folder, exist_ok=True)
+        gw.to_csv(os.path.join(folder, 'gw.csv'), index=False)
+    return root
+
+
+def synthetic_prediction_inputs(count, seed=0):
+    """Random /predict-rating payloads."""
+    rng = np.random.default_rng(seed)
+    players = pd.DataFrame({feature: rng.integers(0, 30, size=count) for feature in expected_features})
+    players['minutes'] = rng.integers(0, 3420, size=count)
+    players['price'] = rng.integers(40, 131, size=count) / 10
+    players['element_type'] = rng.integers(1, 5, size=count)
+    return players.to_dict(orient='records')
+
+
+def measure(fn, repeat=3):
+    """Run ``fn`` and return (result, stats) with wall time, peak traced memory and allocations.
+
+    Wall time is the best of ``repeat`` untraced runs; memory and allocation
+    counts come from one extra run under tracemalloc.
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    fn()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocations = sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+
+    return result, {
+        'wall_ms': round(min(timings) * 1000, 3),
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        'peak_kb': round(peak / 1024, 1),
+        'allocations': allocations,
+    }
+
+
+def run_stages(season_dir, prediction_count, repeat=3):
+    """Time every hot path against one synthetic season; returns {stage: stats}."""
+    players_dir = os.path.join(season_dir, 'players')
+    raw_data_path = os.path.join(season_dir, 'players_raw.csv')
+    store_file = os.path.join(season_dir, 'season.joblib')
+    results = {}
+
+    all_data, results['load_player_data'] = measure(lambda: load_player_data(players_dir, raw_data_path), repeat)
+    results['load_player_data']['rows'] = len(all_data)
+
+    _, results['score_points'] = measure(lambda: score_points(all_data), repeat)
+    results['score_points']['rows'] = len(all_data)
+
+    save_season_store(all_data, store_file)
+    _, results['load_season_store'] = measure(lambda: load_season_store(store_file), repeat)
+
+    latest_data, results['prepare_latest_data'] = measure(lambda: prepare_latest_data(all_data), repeat)
+    results['prepare_latest_data']['rows'] = len(latest_data)
+
+    _, results['select_best_team'] = measure(
+        lambda: select_best_team(TEAM_STRUCTURE, MAX_PLAYERS_PER_TEAM, MAX_SPEND, latest_data), repeat)
+    _, results['optimize_branch_and_bound'] = measure(
+        lambda: optimize_team(latest_data, TEAM_STRUCTURE, MAX_PLAYERS_PER_TEAM, MAX_SPEND, 'branch_and_bound'),
+        repeat)
+
+    _, results['clean_column_names'] = measure(lambda: clean_column_names(latest_data.copy()), repeat)
+    records = latest_data.to_dict(orient='records')
+    _, results['json_serialization'] = measure(lambda: json.dumps(records, cls=DjangoJSONEncoder), repeat)
+    results['json_serialization']['rows'] = len(records)
+
+    # Model loading is reported by warm_models, not counted as prediction time
+    registry.warm_up(['rating_model'])
+    players = synthetic_prediction_inputs(prediction_count)
+    factory = RequestFactory()
+    single_requests = [factory.post('/predict-rating', json.dumps(player), content_type='application/json')
+                       for player in players[:MAX_SINGLE_PREDICTIONS]]
+
+    def predict_single():
+        # predict_rating prints each payload; keep that out of the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [predict_rating(request) for request in single_requests]
+
+    _, results['predict_rating_single'] = measure(predict_single, 1)
+    results['predict_rating_single']['rows'] = len(single_requests)
+    _, results['predict_rating_batch'] = measure(lambda: rate_players(players), repeat)
+    results['predict_rating_batch']['rows'] = len(players)
+    return results
+
+
+def calibrate(repeat=5):
+    """Best wall time (ms) of a fixed NumPy and pure-Python workload, a yardstick for machine speed."""
+    values = np.random.default_rng(0).random(500_000)
+
+    def workload():
+        np.sort(values)
+        return sum(i * i for i in range(300_000))
+
+    _, stats = measure(workload, repeat)
+    return stats['wall_ms']
+
+
+def compare_to_baseline(results, baseline, tolerance, min_delta_ms=0.0, speed=1.0):
+    """List of stages whose wall time grew by more than ``tolerance`` (a fraction) over the baseline.
+
+    Baseline times are first multiplied by ``speed``, the ratio of this run's
+    calibration time to the baseline's, so a slower or faster machine does not
+    read as a change. Growth smaller than ``min_delta_ms`` is treated as noise;
+    stages missing from the baseline are not compared.
+    """
+    regressions = []
+    for scale, stages in results.items():
+        for stage, stats in stages.items():
+            reference = baseline.get(scale, {}).get(stage)
+            if reference is None:
+                continue
+            expected = reference['wall_ms'] * speed
+            if stats['wall_ms'] > expected * (1 + tolerance) and stats['wall_ms'] - expected > min_delta_ms:
+                regressions.append({
+                    'scale': scale,
+                    'stage': stage,
+                    'baseline_ms': round(expected, 3),
+                    'wall_ms': stats['wall_ms'],
+                    'change': round(stats['wall_ms'] / expected - 1, 3),
+                })
+    return regressions
@@ -0,0 +1,156 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+
+# Default cache configuration, overridable with SEASON_DATA_CACHE in settings
+DEFAULT_CACHE_CONFIG = {
+    'BACKEND': 'lru',        # 'lru' (in-process) or 'django' (Django cache framework)
+    'MAX_ENTRIES': 4,        # LRU only: prepared seasons kept per process
+    'ALIAS': 'default',      # django only: which entry of settings.CACHES to use
+    'TIMEOUT': None,         # django only: seconds before an entry expires, None = never
+}
+
+
+def cache_config():
+    return {**DEFAULT_CACHE_CONFIG, **getattr(settings, 'SEASON_DATA_CACHE', {})}
+
+
+class LRUBackend:
+    """In-process least-recently-used store of prepared objects."""
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DjangoCacheBackend:
+    """Store prepared objects in one of the configured Django caches (locmem, file, ...)."""
+
+    def __init__(self, alias='default', timeout=None):
+        self.alias = alias
+        self.timeout = timeout
+
+    @staticmethod
+    def _cache_key(key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return f'season-data:{digest}'
+
+    def get(self, key):
+        return caches[self.alias].get(self._cache_key(key))
+
+    def set(self, key, value):
+        caches[self.alias].set(self._cache_key(key), value, self.timeout)
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+class SeasonDataCache:
+    """Cache of prepared season data keyed on (season, source signature).
+
+    Concurrent misses for the same key are coalesced: the first caller builds
+    the value while the others wait for it instead of rebuilding in parallel.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    @classmethod
+    def from_settings(cls):
+        config = cache_config()
+        if config['BACKEND'] == 'django':
+            backend = DjangoCacheBackend(config['ALIAS'], config['TIMEOUT'])
+        elif config['BACKEND'] == 'lru':
+            backend = LRUBackend(config['MAX_ENTRIES'])
+        else:
+            raise ValueError(f"Unknown SEASON_DATA_CACHE backend: {config['BACKEND']}")
+        return cls(backend)
+
+    def _key_lock(self, key):
+        with self._lock:
+            if key not in self._key_locks:
+                self._key_locks[key] = threading.Lock()
+            return self._key_locks[key]
+
+    def get_or_build(self, season, signature, build):
+        """Return the cached value for this season and signature, building it at most once."""
+        key = (season, tuple(signature))
+        value = self.backend.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        key_lock = self._key_lock(key)
+        try:
+            with key_lock:
+                # Another request may have finished building while we waited
+                value = self.backend.get(key)
+                if value is not None:
+                    with self._lock:
+                        self.hits += 1
+                        self.waits += 1
+                    return value
+
+                with self._lock:
+                    self.misses += 1
+                value = build()
+                self.backend.set(key, value)
+        finally:
+            # Also when build() raises, so a failed key does not keep its lock forever
+            with self._lock:
+                self._key_locks.pop(key, None)
+        return value
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """Hit/miss counters for this process."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': type(self.backend).__name__,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced_waits': self.waits,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+season_cache = SeasonDataCache.from_settings()
+
+# Objects holding locks or memo tables that requests keep filling in (the
+# transfer planner, squad simulator, history index) stay in this process
+# whatever the configured backend: a shared backend would have to pickle
+# them and would hand every hit a copy without the memos
+local_cache = SeasonDataCache(LRUBackend(cache_config()['MAX_ENTRIES']))
@@ -0,0 +1,264 @@
+import math
+import time
+import numpy as np
+import pandas as pd
+from django.http import JsonResponse
+from django.views import View
+
+from .cache import season_cache
+from .metrics import record_rows, span
+from .recomender import (CURRENT_SEASON, MAX_PLAYERS_PER_TEAM, MAX_SPEND, TEAM_STRUCTURE, clean_column_names,
+                         DEFAULT_DEADLINE_MS, fill_missing, get_season_data, price_to_value, season_signature)
+
+POSITIONS = list(TEAM_STRUCTURE)
+
+# Exact engine a query falls back to when the greedy walk cannot fill the squad
+FALLBACK_ENGINE = 'milp'
+# Objective bonus that keeps locked players in the exact solve (far above any squad's points)
+LOCKED_BONUS = 1e4
+
+
+class CandidateIndex:
+    """Per-data-version index the parameterized recommender queries run against.
+
+    Built once from the prepared season: for every position the players in
+    select_best_team's points-per-value order and in price order, their
+    cost, club and points as arrays, and each player's response record
+    already formatted. A query then only walks these arrays.
+    """
+
+    def __init__(self, latest_data, team_mapping):
+        players = latest_data.copy()
+        players['points_per_value'] = players['average_total_points'] / players['value']
+        self.by_value = {}
+        frames = []
+        offset = 0
+        for position in POSITIONS:
+            # Same sort as select_best_players_for_position, so default queries pick the same squad
+            ordered = players[players['element_type'] == position].sort_values(by='points_per_value',
+                                                                               ascending=False)
+            ordered = ordered.drop_duplicates('id').dropna(subset=['value', 'team'])
+            self.by_value[position] = np.arange(offset, offset + len(ordered))
+            offset += len(ordered)
+            frames.append(ordered)
+        candidates = pd.concat(frames, ignore_index=True)
+
+        self.ids = candidates['id'].to_numpy()
+        self.row_of = {player_id: row for row, player_id in enumerate(self.ids.tolist())}
+        self.points = candidates['average_total_points'].to_numpy(np.float64)
+        self.cost = candidates['value'].to_numpy(np.float64)
+        self.team = candidates['team'].astype(object).to_numpy()
+        self.position = candidates['element_type'].astype(object).to_numpy()
+        self.by_cost = {position: rows[np.argsort(self.cost[rows], kind='stable')]
+                        for position, rows in self.by_value.items()}
+        # Plain lists for the per-pick loops, and a frame for the exact fallback
+        self.by_cost_rows = {position: rows.tolist() for position, rows in self.by_cost.items()}
+        self.cost_list = self.cost.tolist()
+        self.team_list = self.team.tolist()
+        self.frame = pd.DataFrame({'id': self.ids, 'element_type': self.position, 'value': self.cost,
+                                   'team': self.team, 'average_total_points': self.points})
+
+        records = fill_missing(clean_column_names(candidates.drop(columns=['points_per_value'])))
+        records['teamName'] = records['teamId'].map(team_mapping)
+        self.records = records.drop(columns=['teamId']).to_dict(orient='records')
+
+    def rows(self, player_ids, label):
+        """Index rows of the players, each once in the order given; raises ValueError for unknown ids."""
+        player_ids = list(dict.fromkeys(player_ids))
+        unknown = [player_id for player_id in player_ids if player_id not in self.row_of]
+        if unknown:
+            raise ValueError(f'Unknown {label} players: {unknown}')
+        return [self.row_of[player_id] for player_id in player_ids]
+
+    def _cheapest(self, available, team_structure):
+        """Per position, cost of the cheapest k available players for every k (prefix sums by price)."""
+        cheapest = {}
+        for position in team_structure:
+            rows = self.by_cost[position]
+            cheapest[position] = np.r_[0.0, np.cumsum(self.cost[rows[available[rows]]])]
+        return cheapest
+
+    def _completion_cost(self, remaining, available, team_counts, max_players_per_team):
+        """Cheapest fill of the ``remaining`` (position, count) slots, or inf when it cannot be filled.
+
+        Only players still available from clubs below the cap are counted. The
+        cap is not applied among the fill itself, so this never overestimates.
+        """
+        total = 0.0
+        for position, count in remaining:
+            taken = 0
+            for row in self.by_cost_rows[position]:
+                if taken == count:
+                    break
+                if available[row] and team_counts.get(self.team_list[row], 0) < max_players_per_team:
+                    total += self.cost_list[row]
+                    taken += 1
+            if taken < count:
+                return math.inf
+        return total
+
+    def query(self, max_spend=MAX_SPEND, locked=(), excluded=(), team_structure=None,
+              max_players_per_team=MAX_PLAYERS_PER_TEAM):
+        """Squad for one set of parameters, picked greedily by points per value.
+
+        Locked players are placed first. Before each pick, the cheapest
+        completion of the remaining slots is recomputed from the players
+        still available at clubs below the cap. A candidate is skipped when
+        that completion would not fit the budget. If the greedy walk still
+        gets stuck, the query is solved exactly (see exact_query). Raises
+        ValueError when the parameters rule out a full squad.
+        """
+        team_structure = team_structure or TEAM_STRUCTURE
+        locked_rows = self.rows(locked, 'locked')
+        excluded_rows = self.rows(excluded, 'excluded')
+        if set(locked_rows) & set(excluded_rows):
+            raise ValueError('A player cannot be both locked and excluded')
+
+        slots = dict(team_structure)
+        spent = 0.0
+        team_counts = {}
+        for row in locked_rows:
+            position = self.position[row]
+            if slots.get(position, 0) <= 0:
+                raise ValueError(f'Too many locked {position} players for the formation')
+            slots[position] -= 1
+            spent += self.cost[row]
+            team_counts[self.team[row]] = team_counts.get(self.team[row], 0) + 1
+        if any(count > max_players_per_team for count in team_counts.values()):
+            raise ValueError('Locked players exceed the per-team cap')
+
+        available = np.ones(len(self.ids), dtype=bool)
+        available[locked_rows + excluded_rows] = False
+        cheapest = self._cheapest(available, team_structure)
+        if any(len(cheapest[position]) <= count for position, count in slots.items()):
+            raise ValueError('Not enough candidates left to fill the formation')
+        # Minimum spend still to come once a position is done, for the budget pruning
+        later = {}
+        still_to_come = 0.0
+        for position in reversed(list(team_structure)):
+            later[position] = still_to_come
+            still_to_come += cheapest[position][slots[position]]
+        if spent + still_to_come > max_spend + 1e-9:
+            raise ValueError('Budget too small for the locked players and formation')
+
+        order = list(team_structure)
+        available = available.tolist()
+        chosen = list(locked_rows)
+        for p, position in enumerate(order):
+            needed = slots[position]
+            for row in self.by_value[position].tolist():
+                if needed == 0:
+                    break
+                if not available[row]:
+                    continue
+                team = self.team_list[row]
+                if team_counts.get(team, 0) >= max_players_per_team:
+                    continue
+                cost = self.cost_list[row]
+                # The prefix sums also count picked players, so they can only under-reserve: a cheap first test
+                if spent + cost + cheapest[position][needed - 1] + later[position] > max_spend + 1e-9:
+                    continue
+                available[row] = False
+                team_counts[team] = team_counts.get(team, 0) + 1
+                remaining = [(position, needed - 1)] + [(after, slots[after]) for after in order[p + 1:]]
+                if spent + cost + self._completion_cost(remaining, available, team_counts,
+                                                        max_players_per_team) > max_spend + 1e-9:
+                    available[row] = True
+                    team_counts[team] -= 1
+                    continue
+                chosen.append(row)
+                spent += cost
+                needed -= 1
+            if needed:
+                return self.exact_query(max_spend, locked_rows, excluded_rows, team_structure, max_players_per_team)
+        return chosen
+
+    def exact_query(self, max_spend, locked_rows, excluded_rows, team_structure, max_players_per_team):
+        """Solve a query with an exact optimizer engine; locked players get a bonus so they are always kept."""
+        from .optimizer import optimize_team
+
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[excluded_rows] = False
+        bonus = np.zeros(len(self.ids))
+        bonus[locked_rows] = LOCKED_BONUS
+        frame = self.frame[keep]
+        objective = frame['average_total_points'].fillna(0) + bonus[keep]
+        team_df, info = optimize_team(frame, team_structure, max_players_per_team, max_spend, FALLBACK_ENGINE,
+                                      DEFAULT_DEADLINE_MS / 1000, objective)
+        rows = [self.row_of[player_id] for player_id in team_df['id'].tolist()]
+        locked_set = set(locked_rows)
+        if not info['complete'] or not locked_set <= set(rows):
+            raise ValueError('Could not fill the formation within the budget and per-team cap')
+        # Rows are numbered by position, then points per value
+        return list(locked_rows) + sorted(row for row in rows if row not in locked_set)
+
+    def payload(self, chosen):
+        return {
+            'team': [self.records[row] for row in chosen],
+            'total_points': round(float(self.points[chosen].sum()), 2),
+            'total_spend': round(float(self.cost[chosen].sum()), 2),
+        }
+
+
+def get_candidate_index(season=CURRENT_SEASON):
+    """Candidate index for a season, rebuilt only when its source files change."""
+    signature = season_signature(season)
+
+    def build():
+        season_data = get_season_data(season)
+        return CandidateIndex(season_data['latest_data'], season_data['team_mapping'])
+
+    return season_cache.get_or_build(f'candidates:{season}', signature, build)
+
+
+def _id_list(value):
+    """Comma separated ids, each kept once in the order given."""
+    ids = [int(player_id) for player_id in value.split(',') if player_id.strip()] if value else []
+    return list(dict.fromkeys(ids))
+
+
+def parse_query_params(params):
+    """Budget (£m), locked/excluded ids, formation (GK-DEF-MID-FWD) and team cap from query parameters."""
+    try:
+        max_spend = price_to_value(params['budget']) if 'budget' in params else MAX_SPEND
+        max_players_per_team = int(params.get('team_cap', MAX_PLAYERS_PER_TEAM))
+        locked = _id_list(params.get('locked'))
+        excluded = _id_list(params.get('excluded'))
+        team_structure = TEAM_STRUCTURE
+        if params.get('formation'):
+            counts = [int(count) for count in params['formation'].split('-')]
+            if len(counts) != len(POSITIONS):
+                raise ValueError
+            team_structure = dict(zip(POSITIONS, counts))
+    except ValueError:
+        raise ValueError('Expected budget (£m), team_cap (integer), locked/excluded (comma separated ids) '
+                         'and formation as GK-DEF-MID-FWD counts, e.g. 2-5-5-3')
+    if max_spend <= 0 or max_players_per_team < 1 or any(count < 0 for count in team_structure.values()):
+        raise ValueError('budget and team_cap must be positive and formation counts non-negative')
+    return {'max_spend': max_spend, 'locked': locked, 'excluded': excluded,
+            'team_structure': team_structure, 'max_players_per_team': max_players_per_team}
+
+
+class RecommendTeamQueryView(View):
+    def get(self, request):
+        try:
+            params = parse_query_params(request.GET)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        try:
+            with span('season_data'):
+                index = get_candidate_index()
+            started = time.perf_counter()
+            with span('optimize'):
+                chosen = index.query(**params)
+            record_rows('optimize', len(index.ids))
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+
+        payload = index.payload(chosen)
+        payload['query'] = {**params, 'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)}
+        with span('serialize'):
+            return JsonResponse(payload)
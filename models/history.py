@@ -0,0 +1,274 @@
+import glob
+import math
+import os
+import numpy as np
+import pandas as pd
+from django.http import JsonResponse
+from django.views import View
+
+from .cache import local_cache
+from .recomender import BASE_DIR, normalize_name
+
+# Season summaries shipped with the repo: players_<season>.csv and predicted_ratings_<season>.csv
+HISTORY_DIR = os.path.join(BASE_DIR, 'data')
+
+# Columns every season's players file has
+STAT_COLUMNS = [
+    'total_points', 'minutes', 'goals_scored', 'assists', 'clean_sheets', 'goals_conceded',
+    'bonus', 'bps', 'yellow_cards', 'red_cards', 'influence', 'creativity', 'threat',
+    'ict_index', 'selected_by_percent', 'now_cost',
+]
+SORT_COLUMNS = STAT_COLUMNS + ['predicted_rating']
+
+# Later seasons spell the goalkeeper position GKP
+POSITIONS = {'GKP': 'GK'}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_CACHED_QUERIES = 512
+
+
+def history_seasons(history_dir=None):
+    """Seasons with a players_<season>.csv file, oldest first."""
+    history_dir = history_dir or HISTORY_DIR
+    paths = glob.glob(os.path.join(history_dir, 'players_*.csv'))
+    return sorted(os.path.basename(path)[len('players_'):-len('.csv')] for path in paths)
+
+
+def history_signature(history_dir=None):
+    """Sizes and mtimes of every history file, so the index is rebuilt when one changes."""
+    history_dir = history_dir or HISTORY_DIR
+    paths = sorted(glob.glob(os.path.join(history_dir, 'players_*.csv')) +
+                   glob.glob(os.path.join(history_dir, 'predicted_ratings_*.csv')))
+    return tuple((os.path.basename(path), os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in paths)
+
+
+def load_history_table(history_dir=None):
+    """One row per player and season, with the season's predicted rating where there is one.
+
+    Players are matched across seasons, and to their predictions, by
+    normalize_name. Predictions are also matched on position and price, which
+    separates the few players who share a name within a season.
+    """
+    history_dir = history_dir or HISTORY_DIR
+    frames = []
+    for season in history_seasons(history_dir):
+        players = pd.read_csv(os.path.join(history_dir, f'players_{season}.csv'),
+                              usecols=['name', 'position'] + STAT_COLUMNS)
+        players['season'] = season
+        players['position'] = players['position'].replace(POSITIONS)
+        players['key'] = players['name'].map(normalize_name)
+
+        ratings_path = os.path.join(history_dir, f'predicted_ratings_{season}.csv')
+        if os.path.exists(ratings_path):
+            ratings = pd.read_csv(ratings_path, usecols=['name', 'position', 'now_cost', 'predicted_rating'])
+            ratings['position'] = ratings['position'].replace(POSITIONS)
+            ratings['key'] = ratings['name'].map(normalize_name)
+            ratings = ratings.drop_duplicates(['key', 'position', 'now_cost']).drop(columns=['name'])
+            players = players.merge(ratings, on=['key', 'position', 'now_cost'], how='left')
+        else:
+            players['predicted_rating'] = np.nan
+        frames.append(players)
+
+    table = pd.concat(frames, ignore_index=True)
+    keys = sorted(table['key'].unique())
+    table['history_id'] = table['key'].map({key: i + 1 for i, key in enumerate(keys)})
+    table = table.sort_values(['history_id', 'season'], kind='stable').reset_index(drop=True)
+
+    # Predicted vs actual, as percentile ranks within the season and position
+    by_group = table.groupby(['season', 'position'])
+    table['actual_percentile'] = (by_group['total_points'].rank(pct=True) * 100).round(1)
+    table['predicted_percentile'] = (by_group['predicted_rating'].rank(pct=True) * 100).round(1)
+    table['percentile_error'] = (table['predicted_percentile'] - table['actual_percentile']).round(1)
+    return table[['history_id', 'season', 'name', 'position'] + STAT_COLUMNS +
+                 ['predicted_rating', 'actual_percentile', 'predicted_percentile', 'percentile_error', 'key']]
+
+
+def _json_value(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def paginate(items, page, page_size):
+    total = len(items)
+    start = (page - 1) * page_size
+    return {
+        'results': items[start:start + page_size],
+        'page': page,
+        'page_size': page_size,
+        'total': total,
+        'pages': max(math.ceil(total / page_size), 1),
+    }
+
+
+class HistoryIndex:
+    """Read-only index over every season's player summary.
+
+    Season rows are kept as dicts, grouped by player and by season. Query
+    results are memoized per set of parameters, so repeated pages of the same
+    query are slices of one cached list.
+    """
+
+    def __init__(self, table):
+        self.seasons = sorted(table['season'].unique().tolist())
+        self.records = [{key: _json_value(value) for key, value in row.items()}
+                        for row in table.to_dict(orient='records')]
+        self.by_player = {}
+        self.by_season = {}
+        for i, record in enumerate(self.records):
+            self.by_player.setdefault(record['history_id'], []).append(i)
+            self.by_season.setdefault(record['season'], []).append(i)
+        self.names = {history_id: self.records[rows[-1]]['name'] for history_id, rows in self.by_player.items()}
+        self.search_keys = {history_id: self.records[rows[-1]]['key'].lower()
+                            for history_id, rows in self.by_player.items()}
+        self._queries = {}
+
+    def _cached(self, key, build):
+        if key not in self._queries:
+            if len(self._queries) >= MAX_CACHED_QUERIES:
+                self._queries.clear()
+            self._queries[key] = build()
+        return self._queries[key]
+
+    def _public(self, i):
+        return {key: value for key, value in self.records[i].items() if key != 'key'}
+
+    def players(self, search=None, season=None, position=None, sort='total_points'):
+        """Season rows matching the filters, best ``sort`` first."""
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f'sort must be one of {SORT_COLUMNS}')
+
+        def build():
+            if search:
+                needle = normalize_name(search).lower()
+                ids = [history_id for history_id, key in self.search_keys.items() if needle in key]
+                rows = [i for history_id in ids for i in self.by_player[history_id]]
+            else:
+                rows = range(len(self.records))
+            rows = [i for i in rows
+                    if (season is None or self.records[i]['season'] == season) and
+                       (position is None or self.records[i]['position'] == position)]
+            rows.sort(key=lambda i: (self.records[i][sort] is None, -(self.records[i][sort] or 0)))
+            return [self._public(i) for i in rows]
+
+        return self._cached(('players', search, season, position, sort), build)
+
+    def career(self, history_id):
+        """A player's seasons and the change in every stat from one season to the next."""
+        rows = self.by_player.get(history_id)
+        if rows is None:
+            return None
+
+        def build():
+            seasons = [self._public(i) for i in rows]
+            deltas = []
+            for before, after in zip(seasons, seasons[1:]):
+                deltas.append({
+                    'from_season': before['season'],
+                    'to_season': after['season'],
+                    **{col: (None if before[col] is None or after[col] is None
+                             else round(after[col] - before[col], 2))
+                       for col in STAT_COLUMNS + ['predicted_rating']},
+                })
+            return {'history_id': history_id, 'name': self.names[history_id], 'seasons': seasons, 'deltas': deltas}
+
+        return self._cached(('career', history_id), build)
+
+    def predictions(self, season, position=None):
+        """Predicted vs actual for a season: per-player percentiles plus a summary."""
+        if season not in self.by_season:
+            raise ValueError(f'season must be one of {self.seasons}')
+
+        def build():
+            rows = [i for i in self.by_season[season]
+                    if self.records[i]['predicted_rating'] is not None and
+                       (position is None or self.records[i]['position'] == position)]
+            # Largest misses first
+            rows.sort(key=lambda i: -abs(self.records[i]['percentile_error']))
+            players = [self._public(i) for i in rows]
+            predicted = np.array([player['predicted_rating'] for player in players], dtype=np.float64)
+            actual = np.array([player['total_points'] for player in players], dtype=np.float64)
+            errors = np.array([player['percentile_error'] for player in players], dtype=np.float64)
+            rank_correlation = None
+            if len(players) > 1:
+                rank_correlation = round(float(pd.Series(predicted).corr(pd.Series(actual), method='spearman')), 3)
+            summary = {
+                'season': season,
+                'position': position,
+                'players': len(players),
+                'rank_correlation': rank_correlation,
+                'mean_abs_percentile_error': round(float(np.abs(errors).mean()), 2) if len(players) else None,
+            }
+            return summary, players
+
+        return self._cached(('predictions', season, position), build)
+
+
+def get_history_index():
+    """History index over every season's files, rebuilt only when one of them changes.
+
+    Kept in this process so the memoized query results survive between requests.
+    """
+    return local_cache.get_or_build('history', history_signature(), lambda: HistoryIndex(load_history_table()))
+
+
+def _page_params(params):
+    try:
+        page = int(params.get('page', 1))
+        page_size = min(int(params.get('page_size', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        raise ValueError('page and page_size must be positive integers')
+    if page < 1 or page_size < 1:
+        raise ValueError('page and page_size must be positive integers')
+    return page, page_size
+
+
+class HistoryPlayersView(View):
+    def get(self, request):
+        try:
+            page, page_size = _page_params(request.GET)
+            sort = request.GET.get('sort', 'total_points')
+            if sort not in SORT_COLUMNS:
+                raise ValueError(f'sort must be one of {SORT_COLUMNS}')
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        try:
+            index = get_history_index()
+            season = request.GET.get('season')
+            if season is not None and season not in index.seasons:
+                return JsonResponse({'error': f'season must be one of {index.seasons}'}, status=400)
+            results = index.players(request.GET.get('search'), season, request.GET.get('position'), sort)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+        return JsonResponse(paginate(results, page, page_size))
+
+
+class HistoryCareerView(View):
+    def get(self, request, history_id):
+        try:
+            career = get_history_index().career(history_id)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+        if career is None:
+            return JsonResponse({'error': 'Player not found'}, status=404)
+        return JsonResponse(career)
+
+
+class HistoryPredictionsView(View):
+    def get(self, request):
+        try:
+            page, page_size = _page_params(request.GET)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        try:
+            index = get_history_index()
+            season = request.GET.get('season', index.seasons[-1])
+            if season not in index.seasons:
+                return JsonResponse({'error': f'season must be one of {index.seasons}'}, status=400)
+            summary, players = index.predictions(season, request.GET.get('position'))
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+        return JsonResponse({'summary': summary, **paginate(players, page, page_size)})
@@ -0,0 +1,158 @@
+import io
+import os
+import pickle
+import numpy as np
+import pandas as pd
+
+INGEST_VERSION = 1
+
+# Bytes kept from the end of each consumed file to detect rewrites
+TAIL_CHECK_BYTES = 64
+
+
+def _empty_state(columns, window):
+    return {'version': INGEST_VERSION, 'columns': list(columns), 'window': window,
+            'files': {}, 'recent': None, 'dtypes': {}}
+
+
+def load_ingest_state(path, columns, window):
+    """Saved ingest state, or a fresh one when missing or written for other columns/window."""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if (state.get('version') == INGEST_VERSION and state.get('columns') == list(columns)
+                and state.get('window') == window):
+            return state
+    return _empty_state(columns, window)
+
+
+def save_ingest_state(state, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    # Plain pickle: the state is mostly small per-file records, which the C pickler handles fastest
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _read_new_lines(path, size, record):
+    """Read what was appended to a gw.csv since ``record`` was taken.
+
+    Returns (header, new bytes, reparsed). The whole file is read again when it
+    is new, shrank, or no longer ends in the bytes consumed last time.
+    """
+    with open(path, 'rb') as f:
+        if record is not None and size >= record['offset']:
+            tail = record['tail']
+            f.seek(record['offset'] - len(tail))
+            data = f.read()
+            if data.startswith(tail):
+                return record['header'], data[len(tail):], False
+            f.seek(0)
+        data = f.read()
+    header, _, body = data.partition(b'\n')
+    return header, body, True
+
+
+def _conform(frame, dtypes):
+    """Cast columns back to the dtypes seen so far; widen the record when a cast would lose data."""
+    for col in frame.columns:
+        dtype = dtypes.get(col)
+        if dtype is not None and str(frame[col].dtype) != dtype:
+            try:
+                frame[col] = frame[col].astype(dtype)
+            except (TypeError, ValueError):
+                pass
+        dtypes[col] = str(frame[col].dtype)
+    return frame
+
+
+def ingest_gameweeks(players_dir, state_path, columns, window, save=True):
+    """Gameweek rows of the last ``window`` rounds, parsing only what was appended since the last run.
+
+    Each player's gw.csv is remembered by the byte offset consumed so far, so a
+    new gameweek costs one short read per player and one CSV parse for all of
+    them together. The rows inside the window are kept in the saved state in
+    the order load_player_data produces, so prepare_latest_data gives the same
+    result as on the full season. With ``save`` off the state file is only
+    read, and what was appended since it was written is parsed again on every
+    call. Returns (frame, summary).
+    """
+    state = load_ingest_state(state_path, columns, window)
+    files = state['files']
+    order = {}
+    new_chunks = {}
+    reparsed = set()
+    changed = 0
+
+    for player_folder in os.scandir(players_dir):
+        if not player_folder.is_dir():
+            continue
+        csv_file_path = os.path.join(player_folder.path, 'gw.csv')
+        try:
+            size = os.stat(csv_file_path).st_size
+        except FileNotFoundError:
+            continue
+        player_id = int(player_folder.name.rsplit('_', 1)[1])
+        order[player_id] = len(order)
+
+        record = files.get(player_folder.name)
+        if record is not None and record['offset'] == size:
+            continue
+        changed += 1
+        header, new_bytes, full = _read_new_lines(csv_file_path, size, record)
+        if full:
+            reparsed.add(player_id)
+            consumed = header + b'\n' + new_bytes
+        else:
+            consumed = record['tail'] + new_bytes
+        files[player_folder.name] = {'id': player_id, 'header': header, 'offset': size,
+                                     'tail': consumed[-TAIL_CHECK_BYTES:]}
+
+        lines = [line for line in new_bytes.split(b'\n') if line.strip()]
+        if lines:
+            new_chunks.setdefault(header, []).append((player_id, lines))
+
+    removed = [name for name in files if files[name]['id'] not in order]
+    for name in removed:
+        del files[name]
+
+    # One parse per distinct header for everything that was appended
+    new_frames = []
+    for header, chunks in new_chunks.items():
+        body = b'\n'.join(line for _, lines in chunks for line in lines)
+        frame = pd.read_csv(io.BytesIO(header + b'\n' + body), usecols=columns)
+        frame['id'] = np.repeat([player_id for player_id, _ in chunks], [len(lines) for _, lines in chunks])
+        new_frames.append(frame)
+    rows_parsed = sum(len(frame) for frame in new_frames)
+
+    recent = state['recent']
+    if recent is not None:
+        keep = recent['id'].isin(order.keys()) & ~recent['id'].isin(reparsed)
+        recent = recent[keep]
+    frames = [frame for frame in [recent] + new_frames if frame is not None and len(frame)]
+    if frames:
+        recent = pd.concat(frames, ignore_index=True)
+        game_week = recent['round'].max()
+        recent = recent[recent['round'] > game_week - window]
+        # Players in directory order, each player's rows in file order
+        positions = recent['id'].map(order).to_numpy()
+        recent = _conform(recent.iloc[np.argsort(positions, kind='stable')].reset_index(drop=True),
+                          state['dtypes'])
+    else:
+        recent = pd.DataFrame(columns=list(columns) + ['id'])
+
+    if save and (changed or removed):
+        state['recent'] = recent
+        save_ingest_state(state, state_path)
+
+    summary = {
+        'files_changed': changed,
+        'files_reparsed': len(reparsed),
+        'files_removed': len(removed),
+        'rows_parsed': rows_parsed,
+        'rows_kept': len(recent),
+        'gameweek': int(recent['round'].max()) if len(recent) else None,
+    }
+    return recent, summary
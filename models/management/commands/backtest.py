@@ -0,0 +1,37 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from models.backtest import BACKTEST_WORKERS, START_GAMEWEEK, STRATEGIES, backtest_seasons, run_backtest
+
+
+class Command(BaseCommand):
+    help = ('Replay seasons gameweek by gameweek, pick a squad with each strategy from past data only '
+            'and score it on the realized points.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', action='append',
+                            help='Season with a gameweek tree to replay (repeatable, default all)')
+        parser.add_argument('--strategy', action='append', choices=sorted(STRATEGIES),
+                            help='Strategy to run (repeatable, default all)')
+        parser.add_argument('--workers', type=int, default=BACKTEST_WORKERS, help='Worker processes')
+        parser.add_argument('--start-gameweek', type=int, default=START_GAMEWEEK,
+                            help='First gameweek to pick for')
+        parser.add_argument('--output', help='Write the full report, with per-gameweek rows, to this JSON file')
+
+    def handle(self, *args, **options):
+        seasons = options['season'] or backtest_seasons()
+        if not seasons:
+            raise CommandError('No season with a gameweek tree found under SEASONS_DIR')
+        report = run_backtest(seasons, options['strategy'], options['workers'], options['start_gameweek'])
+
+        for name, summary in report['summary'].items():
+            self.stdout.write(f'{name}: {summary["points"]} points over {summary["gameweeks"]} gameweeks '
+                              f'({summary["mean_points"]} per gameweek, {summary["mean_ms"]} ms per pick)')
+            for season, season_summary in report['by_season'][name].items():
+                self.stdout.write(f'  {season}: {season_summary["points"]} points, '
+                                  f'{season_summary["mean_points"]} per gameweek')
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Backtested {len(report["seasons"])} seasons with {report["workers"]} workers '
+            f'in {report["elapsed_s"]} s (loading {report["load_s"]} s)'))
@@ -0,0 +1,104 @@
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from models.benchmarks import (REAL_GAMEWEEKS, REAL_PLAYERS, calibrate, compare_to_baseline, run_stages,
+                               write_synthetic_season)
+
+BENCHMARKS_DIR = os.path.join(settings.BASE_DIR, 'benchmarks')
+
+
+class Command(BaseCommand):
+    help = ('Benchmark the data pipeline, optimizer and prediction paths on synthetic seasons '
+            'and compare against the stored baseline.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='1,5,20',
+                            help=f'Comma separated multiples of a real season ({REAL_PLAYERS} players)')
+        parser.add_argument('--gameweeks', type=int, default=REAL_GAMEWEEKS, help='Gameweeks per synthetic season')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage (best is kept)')
+        parser.add_argument('--output', default=os.path.join(BENCHMARKS_DIR, 'results.json'))
+        parser.add_argument('--baseline', default=os.path.join(BENCHMARKS_DIR, 'baseline.json'))
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed wall time growth over the baseline, as a fraction')
+        parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                            help='Ignore wall time growth smaller than this many milliseconds')
+        parser.add_argument('--update-baseline', action='store_true', help='Write these results as the new baseline')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit with an error on regressions')
+
+    def handle(self, *args, **options):
+        scales = [int(scale) for scale in options['scales'].split(',') if scale]
+        results = {}
+        calibration_before = calibrate()
+
+        for scale in scales:
+            season_dir = tempfile.mkdtemp(prefix=f'fpl-bench-{scale}x-')
+            try:
+                start = time.perf_counter()
+                write_synthetic_season(season_dir, REAL_PLAYERS * scale, options['gameweeks'], seed=scale)
+                self.stdout.write(f'{scale}x: generated {REAL_PLAYERS * scale} players '
+                                  f'in {time.perf_counter() - start:.1f}s')
+                stages = run_stages(season_dir, REAL_PLAYERS * scale, options['repeat'])
+            finally:
+                shutil.rmtree(season_dir, ignore_errors=True)
+
+            results[f'{scale}x'] = stages
+            for stage, stats in stages.items():
+                self.stdout.write(f"  {stage:<28} {stats['wall_ms']:>10.2f} ms  "
+                                  f"peak {stats['peak_kb']:>10.1f} KB  {stats['allocations']:>8} allocs")
+
+        # Calibrated on both sides of the stages so drift during the run averages out
+        calibration_ms = round((calibration_before + calibrate()) / 2, 3)
+        self.stdout.write(f'Calibration workload: {calibration_ms:.2f} ms')
+        report = {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'gameweeks': options['gameweeks'],
+            'calibration_ms': calibration_ms,
+            'results': results,
+        }
+        os.makedirs(os.path.dirname(options['output']), exist_ok=True)
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if options['update_baseline']:
+            with open(options['baseline'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Baseline updated: {options['baseline']}"))
+            return
+
+        if not os.path.exists(options['baseline']):
+            self.stdout.write(self.style.WARNING('No baseline to compare against (run with --update-baseline)'))
+            return
+
+        with open(options['baseline']) as f:
+            baseline = json.load(f)
+        if not baseline.get('calibration_ms') or baseline.get('gameweeks') != options['gameweeks']:
+            self.stdout.write(self.style.WARNING(
+                'Baseline has no calibration time or was run with other settings; skipping the comparison '
+                '(refresh it with --update-baseline)'))
+            return
+        missing = sorted({stage for scale, stages in results.items() for stage in stages
+                          if stage not in baseline['results'].get(scale, {})})
+        if missing:
+            self.stdout.write(self.style.WARNING(f"Not in the baseline, not compared: {', '.join(missing)}"))
+
+        # Baseline times scaled to this machine's speed
+        speed = calibration_ms / baseline['calibration_ms']
+        self.stdout.write(f'Machine speed relative to the baseline: {speed:.2f}x the time')
+        regressions = compare_to_baseline(results, baseline['results'], options['tolerance'],
+                                          options['min_delta_ms'], speed)
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(
+                f"Regression {regression['scale']} {regression['stage']}: {regression['baseline_ms']:.2f} ms "
+                f"-> {regression['wall_ms']:.2f} ms ({regression['change']:+.0%})"))
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('No regressions against baseline'))
+        elif options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)} stage(s) regressed beyond {options["tolerance"]:.0%}')
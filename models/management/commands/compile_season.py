@@ -0,0 +1,30 @@
+import os
+import time
+from django.core.management.base import BaseCommand
+from models.names import compile_name_index
+from models.recomender import CURRENT_SEASON, compile_season
+
+
+class Command(BaseCommand):
+    help = "Compile a season's gw.csv tree and players_raw.csv into a columnar store, and its player name index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', default=CURRENT_SEASON, help='Season folder, e.g. 2024-25')
+
+    def handle(self, *args, **options):
+        season = options['season']
+        start = time.perf_counter()
+        path, all_data = compile_season(season)
+        elapsed = time.perf_counter() - start
+
+        size_kb = os.path.getsize(path) / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f'Compiled {season}: {len(all_data)} rows, {all_data["id"].nunique()} players '
+            f'-> {path} ({size_kb:.1f} KB) in {elapsed:.2f}s'
+        ))
+
+        # Name lookups are served from this saved index instead of being built on a request
+        start = time.perf_counter()
+        index, path = compile_name_index(season)
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {len(index.entries)} player names -> {path} in {(time.perf_counter() - start) * 1000:.1f} ms'))
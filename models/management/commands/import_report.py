@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from models.startup import import_time_report
+
+
+class Command(BaseCommand):
+    help = ('Measure cold start (WSGI app and URLconf ready) and the slowest imports for each settings '
+            'profile, in a fresh interpreter.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', action='append',
+                            help='Settings module to measure (repeatable, default the full and lean API profiles)')
+        parser.add_argument('--top', type=int, default=10, help='Slowest top-level imports to list')
+
+    def handle(self, *args, **options):
+        profiles = options['profile'] or ['fplmate_backend.settings', 'fplmate_backend.settings_api']
+        for settings_module in profiles:
+            report = import_time_report(settings_module, options['top'])
+            heavy = ', '.join(report['heavy_loaded_at_ready']) or 'none'
+            self.stdout.write(self.style.SUCCESS(
+                f'{settings_module}: ready in {report["ready_s"] * 1000:.0f} ms, {report["modules"]} modules, '
+                f'heavy modules loaded: {heavy}'))
+            self.stdout.write(f'  first request imports: {report["first_request_imports_s"] * 1000:.0f} ms')
+            for entry in report['slowest']:
+                self.stdout.write(f'  {entry["cumulative_ms"]:>9.1f} ms  {entry["module"]}')
@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand
+from models.names import compile_name_index
+from models.recomender import CURRENT_SEASON, load_recent_season_data
+
+
+class Command(BaseCommand):
+    help = "Ingest newly appended gameweek rows into the season's saved rolling window."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', default=CURRENT_SEASON, help='Season folder, e.g. 2024-25')
+
+    def handle(self, *args, **options):
+        season = options['season']
+        start = time.perf_counter()
+        _, summary = load_recent_season_data(season, save=True)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Ingested {season} up to gameweek {summary["gameweek"]}: {summary["rows_parsed"]} new rows from '
+            f'{summary["files_changed"]} changed files ({summary["files_reparsed"]} reparsed in full, '
+            f'{summary["files_removed"]} removed), {summary["rows_kept"]} rows in the window, in {elapsed * 1000:.1f} ms'
+        ))
+
+        # Name lookups are served from this saved index instead of being built on a request
+        start = time.perf_counter()
+        index, path = compile_name_index(season)
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {len(index.entries)} player names -> {path} in {(time.perf_counter() - start) * 1000:.1f} ms'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from models.recomender import CURRENT_SEASON, season_memory_report
+
+
+def _kb(size):
+    return f'{size / 1024:.1f} KB'
+
+
+class Command(BaseCommand):
+    help = "Report the memory footprint of one or more seasons' player data."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', action='append', help='Season folder, e.g. 2024-25 (repeatable)')
+        parser.add_argument('--columns', action='store_true', help='Also list the size of every column')
+
+    def handle(self, *args, **options):
+        total = 0
+        for season in options['season'] or [CURRENT_SEASON]:
+            report = season_memory_report(season)
+            total += report['all_data_bytes'] + report['latest_data_bytes']
+            saved = 1 - report['all_data_bytes'] / report['all_data_untyped_bytes']
+            self.stdout.write(
+                f'{season}: {report["gameweek_rows"]} rows, {report["players"]} players; '
+                f'merged data {_kb(report["all_data_bytes"])} (untyped {_kb(report["all_data_untyped_bytes"])}, '
+                f'{saved:.0%} smaller), prepared data {_kb(report["latest_data_bytes"])}'
+            )
+            if options['columns']:
+                for col, size in sorted(report['columns'].items(), key=lambda item: -item[1]):
+                    self.stdout.write(f'    {col:<28} {_kb(size)}')
+        self.stdout.write(self.style.SUCCESS(f'Total {_kb(total)}'))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from models.training import ESTIMATOR_ARTIFACTS, train_rating_model
+
+
+class Command(BaseCommand):
+    help = 'Train the player rating model from data/players_<season>.csv and write versioned artifacts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', action='append', help='Season to train on (repeatable, default all)')
+        parser.add_argument('--estimator', choices=list(ESTIMATOR_ARTIFACTS), default='linear')
+        parser.add_argument('--n-jobs', type=int, default=-1, help='Parallel jobs for fitting (-1 uses every core)')
+        parser.add_argument('--trees', type=int, default=300, help='Trees in the random forest')
+        parser.add_argument('--no-cache', action='store_true', help='Rebuild the feature matrix even if cached')
+        parser.add_argument('--no-promote', action='store_true',
+                            help='Only write the version directory, leave the served artifacts alone')
+
+    def handle(self, *args, **options):
+        manifest = train_rating_model(
+            seasons=options['season'],
+            estimator=options['estimator'],
+            n_jobs=options['n_jobs'],
+            trees=options['trees'],
+            use_cache=not options['no_cache'],
+            promote=not options['no_promote'],
+        )
+        metrics, timings = manifest['metrics'], manifest['timings']
+        self.stdout.write(
+            f'{manifest["estimator"]} on {", ".join(manifest["seasons"])}: {manifest["rows"]} rows, '
+            f'features {timings["features_ms"]} ms ({"cached" if manifest["feature_cache_hit"] else "built"}), '
+            f'fit {timings["fit_ms"]} ms'
+        )
+        self.stdout.write(f'MAE {metrics["mae"]:.2f}  MSE {metrics["mse"]:.2f}  R2 {metrics["r2"]:.2f}')
+        promoted = '' if options['no_promote'] else ' and promoted'
+        self.stdout.write(self.style.SUCCESS(f'Wrote {manifest["version"]} to {manifest["path"]}{promoted}'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from models.registry import ARTIFACTS, registry
+
+
+class Command(BaseCommand):
+    help = 'Load trained model artifacts and report their size and load time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f'Artifacts to load (default: all present). Known: {", ".join(ARTIFACTS)}')
+
+    def handle(self, *args, **options):
+        for entry in registry.warm_up(options['names'] or None):
+            if not entry['exists']:
+                self.stdout.write(f"{entry['name']:<16} {entry['file']:<24} missing")
+                continue
+            load = f"{entry['load_ms']} ms" if entry['loaded'] else 'not loaded'
+            self.stdout.write(f"{entry['name']:<16} {entry['file']:<24} {entry['size_bytes']:>8} bytes  {load}")
@@ -0,0 +1,166 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from django.http import HttpResponse
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Histogram buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Spans recorded during the current request, read by MetricsMiddleware
+_request_spans = contextvars.ContextVar('request_spans', default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense, one series per label set."""
+
+    def __init__(self, name, help_text, label_names, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted(self._series.items())
+            items = [(labels, (list(counts), total, count)) for labels, (counts, total, count) in items]
+        for labels, (counts, total, count) in items:
+            base = _labels(self.label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{_labels(self.label_names + ("le",), labels + (repr(bound),))} {cumulative}')
+            lines.append(f'{self.name}_bucket{_labels(self.label_names + ("le",), labels + ("+Inf",))} {count}')
+            lines.append(f'{self.name}_sum{base} {total:.6f}')
+            lines.append(f'{self.name}_count{base} {count}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f'{self.name}{_labels(self.label_names, labels)} {value}')
+        return lines
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{str(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+request_latency = Histogram('fplmate_request_seconds', 'Request latency by route.', ('route', 'method', 'status'))
+stage_latency = Histogram('fplmate_stage_seconds', 'Time spent in each pipeline stage.', ('stage',))
+rows_processed = Counter('fplmate_rows_processed_total', 'Rows processed by each pipeline stage.', ('stage',))
+
+
+@contextmanager
+def span(stage):
+    """Time a block as a pipeline stage; also attached to the request's Server-Timing header."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_latency.observe(elapsed, stage)
+        spans = _request_spans.get()
+        if spans is not None:
+            spans.append((stage, elapsed))
+
+
+def record_rows(stage, count):
+    rows_processed.inc(int(count), stage)
+
+
+def start_request():
+    """Begin collecting spans for the current request.
+
+    Returns the list spans are appended to and a token for ``finish_request``.
+    """
+    spans = []
+    return spans, _request_spans.set(spans)
+
+
+def finish_request(token):
+    _request_spans.reset(token)
+
+
+def add_spans(spans):
+    """Attach spans recorded elsewhere (e.g. by a shared computation) to the current request."""
+    current = _request_spans.get()
+    if current is not None:
+        current.extend(spans)
+
+
+def server_timing(spans, total):
+    """Server-Timing header value for a request's spans, durations in milliseconds."""
+    entries = [f'{stage};dur={elapsed * 1000:.2f}' for stage, elapsed in spans]
+    entries.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(entries)
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format."""
+    from .cache import season_cache
+
+    lines = request_latency.render() + stage_latency.render() + rows_processed.render()
+
+    stats = season_cache.stats()
+    lines += ['# HELP fplmate_season_cache_hits_total Prepared season data cache hits.',
+              '# TYPE fplmate_season_cache_hits_total counter',
+              f"fplmate_season_cache_hits_total {stats['hits']}",
+              '# HELP fplmate_season_cache_misses_total Prepared season data cache misses (rebuilds).',
+              '# TYPE fplmate_season_cache_misses_total counter',
+              f"fplmate_season_cache_misses_total {stats['misses']}"]
+
+    rss = peak_rss_bytes()
+    if rss is not None:
+        lines += ['# HELP fplmate_peak_rss_bytes Peak resident set size of this process.',
+                  '# TYPE fplmate_peak_rss_bytes gauge',
+                  f'fplmate_peak_rss_bytes {rss}']
+    return '\n'.join(lines) + '\n'
+
+
+def metrics(request):
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,110 @@
+import cProfile
+import hmac
+import os
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .metrics import finish_request, request_latency, server_timing, start_request
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise middleware that also runs natively under ASGI.
+
+    WhiteNoise 6.7 is sync-only, which makes Django push every ASGI request
+    through a single thread-sensitive executor and serializes async views.
+    Non-static requests are passed straight through on the event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class MetricsMiddleware:
+    """Records latency per route and status, and adds a Server-Timing header.
+
+    Stage spans opened while the request runs (see models.metrics.span) are
+    listed in the header. When PROFILE_REQUESTS is on and PROFILE_SECRET is
+    set, sending ``X-Profile: <PROFILE_SECRET>`` runs the request under
+    cProfile and writes the stats to PROFILE_DIR; profiling is only done for
+    sync requests.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.profile_requests = getattr(settings, 'PROFILE_REQUESTS', False)
+        self.profile_secret = getattr(settings, 'PROFILE_SECRET', '')
+        self.profile_dir = getattr(settings, 'PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles'))
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        spans, token = start_request()
+        profiler = cProfile.Profile() if self._wants_profile(request) else None
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                response = profiler.runcall(self.get_response, request)
+            else:
+                response = self.get_response(request)
+        finally:
+            finish_request(token)
+        self._record(request, response, spans, time.perf_counter() - start)
+        if profiler is not None:
+            response['X-Profile-File'] = self._dump_profile(profiler, request)
+        return response
+
+    async def __acall__(self, request):
+        spans, token = start_request()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            finish_request(token)
+        self._record(request, response, spans, time.perf_counter() - start)
+        return response
+
+    def _wants_profile(self, request):
+        header = request.headers.get('X-Profile')
+        return (self.profile_requests and bool(self.profile_secret) and header is not None
+                and hmac.compare_digest(header, self.profile_secret))
+
+    def _record(self, request, response, spans, elapsed):
+        match = request.resolver_match
+        route = match.route if match is not None else 'unmatched'
+        request_latency.observe(elapsed, route, request.method, response.status_code)
+        response['Server-Timing'] = server_timing(spans, elapsed)
+
+    def _dump_profile(self, profiler, request):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        name = request.path.strip('/').replace('/', '_') or 'root'
+        path = os.path.join(self.profile_dir, f'{name}-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}.prof')
+        profiler.dump_stats(path)
+        return path
@@ -0,0 +1,241 @@
+import bisect
+import os
+import pickle
+import unicodedata
+import numpy as np
+import pandas as pd
+from django.http import JsonResponse
+from django.views import View
+
+from .cache import season_cache
+from .history import history_signature, load_history_table
+from .recomender import CURRENT_SEASON, load_teams_data, normalize_name, season_paths
+from .store import STORE_DIR
+
+POSITION_NAMES = {1: 'GK', 2: 'DEF', 3: 'MID', 4: 'FWD'}
+
+DEFAULT_RESULTS = 10
+MAX_RESULTS = 50
+
+# Smallest Dice similarity between trigram sets for a fuzzy match
+MIN_FUZZY_SCORE = 0.3
+
+# Letters Unicode decomposition leaves alone
+FOLDED_LETTERS = str.maketrans({'ø': 'o', 'Ø': 'O', 'æ': 'ae', 'Æ': 'AE', 'ß': 'ss', 'đ': 'd', 'Đ': 'D',
+                                'ł': 'l', 'Ł': 'L', 'ı': 'i'})
+
+
+def fold_name(name):
+    """Lower-case, accent-free normalize_name key: 'Ødegaard ' -> 'odegaard'."""
+    decomposed = unicodedata.normalize('NFKD', str(name).translate(FOLDED_LETTERS))
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(normalize_name(stripped).lower().replace('_', ' ').split())
+
+
+def trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def load_name_entries(season=CURRENT_SEASON, history_dir=None):
+    """One entry per person across the current season's players_raw.csv and the history files.
+
+    History rows are grouped by history_id; a current player joins the
+    history entry with the same folded full name.
+    """
+    entries = []
+    by_key = {}
+    history = load_history_table(history_dir)
+    for history_id, rows in history.groupby('history_id', sort=True):
+        last = rows.iloc[-1]
+        entry = {'name': last['name'], 'web_name': None, 'id': None, 'history_id': int(history_id),
+                 'position': last['position'], 'team': None, 'seasons': rows['season'].tolist()}
+        by_key.setdefault(fold_name(last['name']), len(entries))
+        entries.append(entry)
+
+    _, raw_data_path, teams_path = season_paths(season)
+    if os.path.exists(raw_data_path):
+        team_mapping = load_teams_data(teams_path) if os.path.exists(teams_path) else {}
+        raw = pd.read_csv(raw_data_path, usecols=['id', 'first_name', 'second_name', 'web_name',
+                                                  'element_type', 'team'])
+        for player in raw.drop_duplicates('id').to_dict(orient='records'):
+            name = f"{player['first_name']} {player['second_name']}"
+            current = {'name': name, 'web_name': player['web_name'], 'id': int(player['id']),
+                       'position': POSITION_NAMES.get(player['element_type']),
+                       'team': team_mapping.get(player['team'], player['team'])}
+            i = by_key.get(fold_name(name))
+            if i is not None and entries[i]['id'] is None:
+                entries[i].update(current)
+                entries[i]['seasons'] = entries[i]['seasons'] + [season]
+            else:
+                entries.append({**current, 'history_id': None, 'seasons': [season]})
+    return entries
+
+
+class NameIndex:
+    """Autocomplete and fuzzy lookup over folded player names.
+
+    Every entry is reachable through its full name and web name. Name words
+    are kept sorted for prefix search by bisection, and each name's trigrams
+    are posted to a trigram index for typo-tolerant matching.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        key_entries = []
+        keys = []
+        words = {}
+        self.entry_keys = []
+        for i, entry in enumerate(entries):
+            entry_keys = {fold_name(name) for name in (entry['name'], entry['web_name']) if isinstance(name, str)}
+            self.entry_keys.append(sorted(entry_keys - {''}))
+            for key in self.entry_keys[-1]:
+                keys.append(key)
+                key_entries.append(i)
+                for word in key.split():
+                    words.setdefault(word, set()).add(i)
+        self.keys = keys
+        self.key_entries = np.array(key_entries, dtype=np.int64)
+        self.words = sorted(words)
+        self.word_entries = [frozenset(words[word]) for word in self.words]
+        # Names current players go by rank ahead of history-only ones
+        self.rank = [(entry['id'] is None, len(entry['name']), entry['name']) for entry in entries]
+
+        postings = {}
+        self.key_sizes = np.zeros(len(keys), dtype=np.float64)
+        for k, key in enumerate(keys):
+            grams = trigrams(key)
+            self.key_sizes[k] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(k)
+        self.postings = {gram: np.array(ids, dtype=np.int64) for gram, ids in postings.items()}
+
+    def _prefix_entries(self, prefix):
+        start = bisect.bisect_left(self.words, prefix)
+        end = bisect.bisect_left(self.words, prefix + '\uffff', start)
+        if end - start == 1:
+            return self.word_entries[start]
+        return frozenset().union(*self.word_entries[start:end])
+
+    def autocomplete(self, query, limit=DEFAULT_RESULTS):
+        """Entries with a name word starting with every typed word; whole-name prefixes first."""
+        key = fold_name(query)
+        if not key:
+            return []
+        matches = None
+        for word in key.split():
+            found = self._prefix_entries(word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        ranked = sorted(matches, key=lambda i: (not any(name.startswith(key) for name in self.entry_keys[i]),
+                                                self.rank[i]))
+        return [(i, 1.0) for i in ranked[:limit]]
+
+    def fuzzy(self, query, limit=DEFAULT_RESULTS, min_score=MIN_FUZZY_SCORE):
+        """Entries ranked by the Dice similarity of their best name's trigrams to the query's."""
+        query_grams = trigrams(fold_name(query))
+        grams = [gram for gram in query_grams if gram in self.postings]
+        if not grams:
+            return []
+        query_size = len(query_grams)
+        shared = np.bincount(np.concatenate([self.postings[gram] for gram in grams]), minlength=len(self.keys))
+        scores = 2 * shared / (query_size + self.key_sizes)
+        candidates = np.flatnonzero(scores >= min_score)
+        best = {}
+        for k in candidates[np.argsort(-scores[candidates], kind='stable')]:
+            best.setdefault(int(self.key_entries[k]), float(scores[k]))
+        ranked = sorted(best.items(), key=lambda item: (-item[1], self.rank[item[0]]))
+        return [(i, round(score, 3)) for i, score in ranked[:limit]]
+
+    def results(self, matches):
+        return [{**self.entries[i], 'score': score} for i, score in matches]
+
+
+def name_index_signature(season=CURRENT_SEASON, history_dir=None):
+    """Sizes and mtimes of the files names are read from: players_raw.csv, teams.csv and the history files."""
+    signature = history_signature(history_dir)
+    for path in season_paths(season)[1:]:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            signature += ((os.path.basename(path), stat.st_size, stat.st_mtime_ns),)
+    return signature
+
+
+def name_index_path(season=CURRENT_SEASON):
+    return os.path.join(STORE_DIR, f'{season}.names.pickle')
+
+
+def compile_name_index(season=CURRENT_SEASON, signature=None):
+    """Build the name index and save it next to the compiled seasons; returns (index, path)."""
+    signature = signature or name_index_signature(season)
+    index = NameIndex(load_name_entries(season))
+    path = name_index_path(season)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'signature': signature, 'index': index}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return index, path
+
+
+class NameIndexUnavailable(Exception):
+    """The saved name index is missing or was built from older files."""
+
+
+def load_name_index(season, signature):
+    """The saved index, which must have been built from the current files.
+
+    Requests never compile it: compile_season and ingest_gameweeks do.
+    """
+    path = name_index_path(season)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            saved = pickle.load(f)
+        if saved.get('signature') == signature:
+            return saved['index']
+    raise NameIndexUnavailable(f'The player name index for {season} is missing or out of date; '
+                               f'run `python manage.py compile_season --season {season}`')
+
+
+def get_name_index(season=CURRENT_SEASON):
+    signature = name_index_signature(season)
+    return season_cache.get_or_build(f'names:{season}', signature, lambda: load_name_index(season, signature))
+
+
+def _search_params(params):
+    query = params.get('q', '').strip()
+    limit = int(params.get('limit', DEFAULT_RESULTS))
+    if not query or not 1 <= limit <= MAX_RESULTS:
+        raise ValueError(f'q is required and limit must be 1-{MAX_RESULTS}')
+    return query, limit
+
+
+class PlayerAutocompleteView(View):
+    def get(self, request):
+        try:
+            query, limit = _search_params(request.GET)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        try:
+            index = get_name_index()
+            return JsonResponse({'query': query, 'results': index.results(index.autocomplete(query, limit))})
+        except NameIndexUnavailable as e:
+            return JsonResponse({'error': str(e)}, status=503)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+
+
+class PlayerSearchView(View):
+    def get(self, request):
+        try:
+            query, limit = _search_params(request.GET)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        try:
+            index = get_name_index()
+            return JsonResponse({'query': query, 'results': index.results(index.fuzzy(query, limit))})
+        except NameIndexUnavailable as e:
+            return JsonResponse({'error': str(e)}, status=503)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
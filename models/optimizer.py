@@ -0,0 +1,313 @@
+import time
+import numpy as np
+
+# Engine used when a caller does not ask for one
+DEFAULT_ENGINE = 'greedy'
+
+# How often (in nodes) the branch-and-bound search checks its deadline
+DEADLINE_CHECK_INTERVAL = 256
+
+
+def _squad_arrays(players_df, team_structure):
+    """Candidate arrays for the positions in ``team_structure``, dropping unusable rows."""
+    candidates = players_df[players_df['element_type'].isin(list(team_structure))]
+    candidates = candidates.dropna(subset=['value', 'team'])
+    candidates = candidates.drop_duplicates('id')
+    return {
+        'rows': candidates.index.to_numpy(),
+        'ids': candidates['id'].to_numpy(),
+        'points': candidates['average_total_points'].fillna(0).to_numpy(np.float64),
+        'cost': candidates['value'].to_numpy(np.float64),
+        'team': candidates['team'].to_numpy(),
+        'position': candidates['element_type'].to_numpy(),
+    }
+
+
+def _top_k_sum(values, k):
+    if k <= 0:
+        return 0.0, np.empty(0, dtype=np.int64)
+    if k >= len(values):
+        return float(values.sum()), np.arange(len(values))
+    top = np.argpartition(-values, k - 1)[:k]
+    return float(values[top].sum()), top
+
+
+def lagrangian_bound(arrays, team_structure, max_spend, iterations=60):
+    """Upper bound on squad points from relaxing the budget with a multiplier.
+
+    For any ``lam >= 0`` the best squad (ignoring club caps) scoring
+    ``points - lam * cost`` plus ``lam * max_spend`` bounds the true optimum;
+    the multiplier is found by bisection on the budget subgradient.
+    Returns ``(bound, lam)``.
+    """
+    position_masks = {position: arrays['position'] == position for position in team_structure}
+
+    def evaluate(lam):
+        reduced = arrays['points'] - lam * arrays['cost']
+        total = lam * max_spend
+        spend = 0.0
+        for position, count in team_structure.items():
+            mask = position_masks[position]
+            value, top = _top_k_sum(reduced[mask], count)
+            total += value
+            spend += float(arrays['cost'][mask][top].sum())
+        return total, spend
+
+    bound, spend = evaluate(0.0)
+    if spend <= max_spend:
+        return bound, 0.0
+
+    low, high = 0.0, 1.0
+    while evaluate(high)[1] > max_spend and high < 1e6:
+        high *= 2
+    best_bound, best_lam = bound, 0.0
+    for _ in range(iterations):
+        lam = (low + high) / 2
+        value, spend = evaluate(lam)
+        if value < best_bound:
+            best_bound, best_lam = value, lam
+        if spend > max_spend:
+            low = lam
+        else:
+            high = lam
+    value, _ = evaluate(high)
+    if value < best_bound:
+        best_bound, best_lam = value, high
+    return best_bound, best_lam
+
+
+def _optimizer_info(engine, objective, bound, optimal, started, nodes=None, complete=True):
+    """Summary of a solve: objective, best known upper bound and relative gap.
+
+    An incomplete squad (fewer players than the structure asks for) is never
+    optimal and has no gap, since its objective is not comparable to the bound.
+    """
+    objective = round(float(objective), 2)
+    optimal = optimal and complete
+    bound = objective if optimal else round(float(bound), 2)
+    if complete:
+        bound = max(bound, objective)
+    info = {
+        'engine': engine,
+        'objective': objective,
+        'bound': bound,
+        'gap': (round((bound - objective) / abs(bound), 4) if bound else 0.0) if complete else None,
+        'optimal': bool(optimal),
+        'complete': bool(complete),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+    if nodes is not None:
+        info['nodes'] = nodes
+    return info
+
+
+def _result(players_df, arrays, chosen, engine, bound, optimal, started, nodes=None, squad_size=None):
+    chosen = list(chosen)
+    objective = arrays['points'][chosen].sum() if chosen else 0.0
+    team_df = players_df.loc[arrays['rows'][chosen]].reset_index(drop=True)
+    complete = squad_size is None or len(chosen) == squad_size
+    return team_df, _optimizer_info(engine, objective, bound, optimal, started, nodes, complete)
+
+
+def greedy_engine(players_df, team_structure, max_players_per_team, max_spend, deadline=None):
+    """The original points-per-value greedy picker, with its gap to the relaxation bound."""
+    from .recomender import select_best_team
+
+    started = time.perf_counter()
+    team_df = select_best_team(team_structure, max_players_per_team, max_spend, players_df)
+    bound, _ = lagrangian_bound(_squad_arrays(players_df, team_structure), team_structure, max_spend)
+    objective = team_df['average_total_points'].sum() if not team_df.empty else 0.0
+    complete = len(team_df) == sum(team_structure.values())
+    return team_df, _optimizer_info('greedy', objective, bound, False, started, complete=complete)
+
+
+def branch_and_bound_engine(players_df, team_structure, max_players_per_team, max_spend, deadline=None):
+    """Exact squad search: depth-first branch and bound over Lagrangian-ordered candidates.
+
+    Candidates are fixed out up front when even the relaxation with them
+    forced in cannot beat the incumbent, and every node is bounded by the
+    same relaxation restricted to the players still available. ``deadline``
+    is in seconds; when it expires the best squad found so far is returned
+    with the remaining optimality gap.
+    """
+    started = time.perf_counter()
+    squad_size = sum(team_structure.values())
+    arrays = _squad_arrays(players_df, team_structure)
+    root_bound, lam = lagrangian_bound(arrays, team_structure, max_spend)
+    reduced = arrays['points'] - lam * arrays['cost']
+
+    # Incumbent from the greedy picker so fixing has something to beat
+    greedy_team, _ = greedy_engine(players_df, team_structure, max_players_per_team, max_spend)
+    id_index = {player_id: i for i, player_id in enumerate(arrays['ids'])}
+    incumbent = [id_index[player_id] for player_id in greedy_team.get('id', []) if player_id in id_index]
+    if len(incumbent) != squad_size:
+        incumbent = []
+    best_points = float(arrays['points'][incumbent].sum()) if incumbent else -np.inf
+
+    # Reduced-cost fixing: drop players who cannot appear in a better squad
+    positions = []
+    for position, count in team_structure.items():
+        members = np.flatnonzero(arrays['position'] == position)
+        members = members[np.argsort(-reduced[members], kind='stable')]
+        if len(members) < count:
+            return _result(players_df, arrays, [], 'branch_and_bound', root_bound, False, started, 0, squad_size)
+        if len(members) > count:
+            kth = reduced[members[count - 1]]
+            forced_bound = root_bound - kth + reduced[members]
+            keep = (forced_bound > best_points + 1e-9) | (np.arange(len(members)) < count)
+            members = members[keep]
+        positions.append((members, count))
+
+    # Per position: prefix sums of reduced profit for the O(1) suffix bound and
+    # the cheapest way to fill k slots from each suffix for budget pruning
+    reduced_prefix = []
+    cheapest = []
+    for members, count in positions:
+        reduced_prefix.append(np.r_[0.0, np.cumsum(reduced[members])])
+        costs = arrays['cost'][members]
+        table = np.full((len(members) + 1, count + 1), np.inf)
+        table[:, 0] = 0.0
+        for start in range(len(members) - 1, -1, -1):
+            suffix = np.sort(costs[start:])[:count]
+            table[start, 1:len(suffix) + 1] = np.cumsum(suffix)
+        cheapest.append(table)
+
+    later_reduced = np.zeros(len(positions) + 1)
+    later_cost = np.zeros(len(positions) + 1)
+    for p in range(len(positions) - 1, -1, -1):
+        count = positions[p][1]
+        later_reduced[p] = later_reduced[p + 1] + reduced_prefix[p][count]
+        later_cost[p] = later_cost[p + 1] + cheapest[p][0, count]
+
+    points = arrays['points']
+    cost = arrays['cost']
+    teams = arrays['team']
+    member_lists = [members.tolist() for members, _ in positions]
+    chosen = []
+    team_counts = {}
+    nodes = 0
+    timed_out = False
+
+    def search(p, start, slots, spent, scored, reduced_spent):
+        nonlocal best_points, incumbent, nodes, timed_out
+        if slots == 0:
+            if p + 1 == len(positions):
+                if scored > best_points + 1e-9:
+                    best_points = scored
+                    incumbent = list(chosen)
+                return
+            p, start, slots = p + 1, 0, positions[p + 1][1]
+
+        members = member_lists[p]
+        prefix = reduced_prefix[p]
+        table = cheapest[p]
+        for i in range(start, len(members) - slots + 1):
+            nodes += 1
+            if deadline is not None and nodes % DEADLINE_CHECK_INTERVAL == 0:
+                if time.perf_counter() - started > deadline:
+                    timed_out = True
+            if timed_out:
+                return
+
+            remaining = max_spend - spent
+            # Budget: cheapest completion from here must fit. Later suffixes
+            # only cost more, so no later i can fit either
+            if table[i, slots] + later_cost[p + 1] > remaining + 1e-9:
+                return
+            # Bound: relaxation over the best remaining reduced profits
+            bound = (reduced_spent + prefix[i + slots] - prefix[i] + later_reduced[p + 1]
+                     + lam * max_spend)
+            if bound <= best_points + 1e-9:
+                return
+
+            player = members[i]
+            team = teams[player]
+            if cost[player] > remaining or team_counts.get(team, 0) >= max_players_per_team:
+                continue
+
+            chosen.append(player)
+            team_counts[team] = team_counts.get(team, 0) + 1
+            search(p, i + 1, slots - 1, spent + cost[player], scored + points[player],
+                   reduced_spent + reduced[player])
+            team_counts[team] -= 1
+            chosen.pop()
+
+    if positions:
+        search(0, 0, positions[0][1], 0.0, 0.0, 0.0)
+
+    return _result(players_df, arrays, incumbent, 'branch_and_bound', root_bound,
+                   not timed_out, started, nodes, squad_size)
+
+
+def milp_engine(players_df, team_structure, max_players_per_team, max_spend, deadline=None):
+    """Solve the squad as a 0/1 integer program with scipy's HiGHS MILP solver."""
+    from scipy.optimize import Bounds, LinearConstraint, milp
+
+    started = time.perf_counter()
+    squad_size = sum(team_structure.values())
+    arrays = _squad_arrays(players_df, team_structure)
+    n = len(arrays['points'])
+
+    rows, lower, upper = [], [], []
+    for position, count in team_structure.items():
+        rows.append((arrays['position'] == position).astype(np.float64))
+        lower.append(count)
+        upper.append(count)
+    for team in np.unique(arrays['team']):
+        rows.append((arrays['team'] == team).astype(np.float64))
+        lower.append(0)
+        upper.append(max_players_per_team)
+    rows.append(arrays['cost'])
+    lower.append(0)
+    upper.append(max_spend)
+
+    options = {}
+    if deadline is not None:
+        options['time_limit'] = max(deadline - (time.perf_counter() - started), 0.001)
+    result = milp(
+        c=-arrays['points'],
+        integrality=np.ones(n),
+        bounds=Bounds(0, 1),
+        constraints=LinearConstraint(np.vstack(rows), lower, upper),
+        options=options,
+    )
+    if result.x is None:
+        bound, _ = lagrangian_bound(arrays, team_structure, max_spend)
+        return _result(players_df, arrays, [], 'milp', bound, False, started, squad_size=squad_size)
+
+    chosen = np.flatnonzero(result.x > 0.5)
+    optimal = result.status == 0
+    bound = -result.mip_dual_bound if getattr(result, 'mip_dual_bound', None) is not None else 0.0
+    return _result(players_df, arrays, chosen, 'milp', bound, optimal, started, squad_size=squad_size)
+
+
+OPTIMIZER_ENGINES = {
+    'greedy': greedy_engine,
+    'branch_and_bound': branch_and_bound_engine,
+    'milp': milp_engine,
+}
+
+
+def optimize_team(players_df, team_structure, max_players_per_team, max_spend, engine=None, deadline=None,
+                  objective=None):
+    """Pick a squad with the named engine and return ``(team_df, info)``.
+
+    ``info`` reports the objective, the best known upper bound and the
+    relative optimality gap between them; ``complete`` is False when the
+    engine could not fill every slot within the budget and club cap.
+    ``objective`` is an optional per-row score (aligned with ``players_df``)
+    maximized in place of average_total_points; the returned rows keep
+    their own points.
+    """
+    engine = engine or DEFAULT_ENGINE
+    if engine not in OPTIMIZER_ENGINES:
+        raise ValueError(f'Unknown optimizer engine: {engine}')
+    if objective is None:
+        return OPTIMIZER_ENGINES[engine](players_df, team_structure, max_players_per_team, max_spend, deadline)
+
+    scored = players_df.assign(average_total_points=objective)
+    team_df, info = OPTIMIZER_ENGINES[engine](scored, team_structure, max_players_per_team, max_spend, deadline)
+    if not team_df.empty:
+        points = players_df.drop_duplicates('id').set_index('id')['average_total_points']
+        team_df['average_total_points'] = team_df['id'].map(points).to_numpy()
+    return team_df, info
@@ -0,0 +1,310 @@
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+from django.http import JsonResponse
+
+from .cache import local_cache
+from .recomender import (CURRENT_SEASON, MAX_PLAYERS_PER_TEAM, TEAM_STRUCTURE, get_season_data, price_to_value,
+                         season_paths, season_signature)
+
+# FPL transfer rules
+TRANSFER_HIT = 4          # points deducted per transfer beyond the free ones
+MAX_FREE_TRANSFERS = 5    # free transfers bank up to this many
+CAPTAIN_MULTIPLIER = 2
+
+# Form points are scaled per fixture by its FPL difficulty rating (1 easiest, 5 hardest)
+FIXTURE_DIFFICULTY_FACTORS = {1: 1.2, 2: 1.1, 3: 1.0, 4: 0.9, 5: 0.8}
+
+# Search limits
+BEAM_WIDTH = 40           # squads kept per gameweek layer
+MOVES_PER_SQUAD = 12      # best single and double transfers expanded per squad
+OUTLOOK_WEEKS = 3         # gameweeks a squad is assumed held for when ranking a layer
+MAX_MEMO_ENTRIES = 50000
+MAX_CACHED_PLANS = 256
+
+# Starting XI formation limits
+MIN_STARTERS = {'DEF': 3, 'MID': 2, 'FWD': 1}
+MAX_HORIZON = 10
+
+
+class TransferPlanner:
+    """Plans transfers over the next gameweeks from prepared season data.
+
+    The search runs forward one gameweek at a time, keeping the best
+    ``BEAM_WIDTH`` squads per gameweek. Layers are ranked without regard to
+    the requested horizon, so completed layers are kept per starting position
+    and asking for a longer horizon only computes the new gameweeks.
+    Transfer options are memoized per (squad, bank) and squad scores per
+    (squad, gameweek), so raising the transfer limit reuses them too.
+
+    ``fixtures`` maps (club, gameweek) to the summed difficulty factor of the
+    club's fixtures that week; without it every gameweek scores form points.
+    """
+
+    def __init__(self, latest_data, next_gameweek, fixtures=None):
+        players = latest_data.drop_duplicates('id').dropna(subset=['value', 'team', 'element_type'])
+        self.next_gameweek = int(next_gameweek)
+        self.ids = players['id'].to_numpy()
+        self.index = {player_id: i for i, player_id in enumerate(self.ids.tolist())}
+        self.points = players['average_total_points'].fillna(0).to_numpy(np.float64)
+        self.cost = players['value'].to_numpy(np.int64)
+        self.team = players['team'].to_numpy()
+        self.position = players['element_type'].to_numpy()
+        self.names = (players['first_name'] + ' ' + players['second_name']).tolist()
+
+        # Players of each position, best projected points first
+        self.by_position = {
+            position: [int(i) for i in np.flatnonzero(self.position == position)[
+                np.argsort(-self.points[self.position == position], kind='stable')]]
+            for position in TEAM_STRUCTURE
+        }
+        self.fixtures = fixtures
+        self._moves_memo = {}
+        self._score_memo = {}
+        self._layers = {}
+        self._lock = threading.Lock()
+
+    def projected_points(self, player, gameweek):
+        """Form points scaled by the player's fixtures that gameweek: 0 for a blank, about 2x for a double."""
+        if self.fixtures is None:
+            return self.points[player]
+        return self.points[player] * self.fixtures.get((self.team[player], gameweek), 0.0)
+
+    def squad_score(self, squad, gameweek):
+        """Best starting XI plus captain for a squad in a gameweek."""
+        key = (squad, gameweek)
+        if key in self._score_memo:
+            return self._score_memo[key]
+
+        by_position = {position: [] for position in TEAM_STRUCTURE}
+        for player in squad:
+            by_position[self.position[player]].append(self.projected_points(player, gameweek))
+        for values in by_position.values():
+            values.sort(reverse=True)
+
+        starters = by_position['GK'][:1]
+        bench = []
+        for position, minimum in MIN_STARTERS.items():
+            starters += by_position[position][:minimum]
+            bench += by_position[position][minimum:]
+        bench.sort(reverse=True)
+        starters += bench[:11 - len(starters)]
+        score = sum(starters) + (CAPTAIN_MULTIPLIER - 1) * max(starters, default=0)
+
+        if len(self._score_memo) > MAX_MEMO_ENTRIES:
+            self._score_memo.clear()
+        self._score_memo[key] = score
+        return score
+
+    def _team_counts(self, squad):
+        counts = {}
+        for player in squad:
+            counts[self.team[player]] = counts.get(self.team[player], 0) + 1
+        return counts
+
+    def _best_replacement(self, squad, counts, out, budget, excluded=()):
+        """Highest-projected player who can replace ``out`` within ``budget``."""
+        for candidate in self.by_position[self.position[out]]:
+            if candidate in squad or candidate in excluded:
+                continue
+            if self.cost[candidate] > budget:
+                continue
+            club = self.team[candidate]
+            if club != self.team[out] and counts.get(club, 0) >= MAX_PLAYERS_PER_TEAM:
+                continue
+            return candidate
+        return None
+
+    def transfer_options(self, squad, bank):
+        """Best single and double transfers for a squad, memoized per (squad, bank)."""
+        key = (squad, bank)
+        if key in self._moves_memo:
+            return self._moves_memo[key]
+
+        counts = self._team_counts(squad)
+        singles = []
+        for out in squad:
+            incoming = self._best_replacement(squad, counts, out, bank + self.cost[out])
+            if incoming is not None:
+                gain = self.points[incoming] - self.points[out]
+                singles.append((gain, ((out, incoming),)))
+        singles.sort(key=lambda move: move[0], reverse=True)
+        singles = singles[:MOVES_PER_SQUAD]
+
+        doubles = []
+        for a in range(len(singles)):
+            (first_out, first_in), = singles[a][1]
+            after_first = (squad - {first_out}) | {first_in}
+            first_counts = self._team_counts(after_first)
+            first_bank = bank + self.cost[first_out] - self.cost[first_in]
+            for b in range(a + 1, len(singles)):
+                (second_out, _), = singles[b][1]
+                if second_out == first_in:
+                    continue
+                second_in = self._best_replacement(after_first, first_counts, second_out,
+                                                   first_bank + self.cost[second_out], excluded=(first_out,))
+                if second_in is None:
+                    continue
+                gain = singles[a][0] + self.points[second_in] - self.points[second_out]
+                doubles.append((gain, ((first_out, first_in), (second_out, second_in))))
+        doubles.sort(key=lambda move: move[0], reverse=True)
+
+        options = {1: singles, 2: doubles[:MOVES_PER_SQUAD]}
+        if len(self._moves_memo) > MAX_MEMO_ENTRIES:
+            self._moves_memo.clear()
+        self._moves_memo[key] = options
+        return options
+
+    def _expand(self, layer, gameweek, max_transfers):
+        """Advance every state in a layer by one gameweek."""
+        next_layer = {}
+        for (squad, bank, free), (score, plan) in layer.items():
+            moves = [(0, ())]
+            for count in range(1, max_transfers + 1):
+                moves += self.transfer_options(squad, bank).get(count, [])
+
+            for _, transfers in moves:
+                new_squad, new_bank = squad, bank
+                for out, incoming in transfers:
+                    new_squad = (new_squad - {out}) | {incoming}
+                    new_bank += self.cost[out] - self.cost[incoming]
+                hits = max(len(transfers) - free, 0) * TRANSFER_HIT
+                new_free = min(max(free - len(transfers), 0) + 1, MAX_FREE_TRANSFERS)
+                week_points = self.squad_score(new_squad, gameweek) - hits
+                state = (new_squad, int(new_bank), new_free)
+                total = score + week_points
+                if state not in next_layer or next_layer[state][0] < total:
+                    step = {'gameweek': gameweek, 'transfers': transfers, 'hits': hits, 'points': week_points}
+                    next_layer[state] = (total, plan + (step,))
+
+        # Keep the squads with the best score so far plus what they would score if held
+        # for the next few gameweeks; independent of the horizon so layers can be reused
+        def outlook(item):
+            (squad, _, _), (total, _) = item
+            return total + sum(self.squad_score(squad, gameweek + week) for week in range(1, OUTLOOK_WEEKS + 1))
+
+        kept = sorted(next_layer.items(), key=outlook, reverse=True)[:BEAM_WIDTH]
+        return dict(kept)
+
+    def plan(self, squad_ids, bank, free_transfers=1, horizon=5, max_transfers=2):
+        """Best transfer plan for the next ``horizon`` gameweeks.
+
+        ``squad_ids`` are the 15 current player ids and ``bank`` is in the same
+        units as ``value``. Returns the plan as a JSON-ready dict.
+        """
+        squad = frozenset(self.index[player_id] for player_id in squad_ids)
+        start = (squad, int(bank), min(max(int(free_transfers), 1), MAX_FREE_TRANSFERS))
+
+        with self._lock:
+            if (start, max_transfers) not in self._layers and len(self._layers) >= MAX_CACHED_PLANS:
+                self._layers.clear()
+            layers = self._layers.setdefault((start, max_transfers), [{start: (0.0, ())}])
+
+            # Earlier gameweeks are reused from previous calls with the same start
+            for week in range(len(layers) - 1, horizon):
+                layers.append(self._expand(layers[week], self.next_gameweek + week, max_transfers))
+
+            (final_squad, final_bank, _), (total, plan) = max(layers[horizon].items(), key=lambda item: item[1][0])
+        return {
+            'total_points': round(float(total), 2),
+            'bank': final_bank,
+            'weeks': [{
+                'gameweek': step['gameweek'],
+                'points': round(float(step['points']), 2),
+                'hits': step['hits'],
+                'transfers': [{'out': self._player(out), 'in': self._player(incoming)}
+                              for out, incoming in step['transfers']],
+            } for step in plan],
+            'final_squad': sorted(int(self.ids[player]) for player in final_squad),
+        }
+
+    def _player(self, player):
+        return {
+            'id': int(self.ids[player]),
+            'name': self.names[player],
+            'position': self.position[player],
+            'price': int(self.cost[player]),
+            'projected_points': round(float(self.points[player]), 2),
+        }
+
+    def validate_squad(self, squad_ids):
+        """Return an error message if ``squad_ids`` is not a legal squad, else None."""
+        unknown = [player_id for player_id in squad_ids if player_id not in self.index]
+        if unknown:
+            return f'Unknown player ids: {unknown}'
+        if len(set(squad_ids)) != sum(TEAM_STRUCTURE.values()):
+            return f'A squad needs {sum(TEAM_STRUCTURE.values())} distinct players'
+        players = [self.index[player_id] for player_id in squad_ids]
+        for position, count in TEAM_STRUCTURE.items():
+            if sum(1 for player in players if self.position[player] == position) != count:
+                return f'A squad needs {count} {position}'
+        if max(self._team_counts(players).values()) > MAX_PLAYERS_PER_TEAM:
+            return f'At most {MAX_PLAYERS_PER_TEAM} players per club'
+        return None
+
+
+def fixtures_path(season):
+    _, raw_data_path, _ = season_paths(season)
+    return os.path.join(os.path.dirname(raw_data_path), 'fixtures.csv')
+
+
+def load_fixture_factors(path):
+    """(club, gameweek) -> summed difficulty factor of that club's fixtures, from fixtures.csv."""
+    fixtures = pd.read_csv(path, usecols=['event', 'team_h', 'team_a', 'team_h_difficulty', 'team_a_difficulty'])
+    fixtures = fixtures.dropna(subset=['event'])
+    factors = {}
+    for side in ('h', 'a'):
+        for team, event, difficulty in zip(fixtures[f'team_{side}'], fixtures['event'],
+                                           fixtures[f'team_{side}_difficulty']):
+            key = (int(team), int(event))
+            factors[key] = factors.get(key, 0.0) + FIXTURE_DIFFICULTY_FACTORS.get(int(difficulty), 1.0)
+    return factors
+
+
+def build_transfer_planner(season):
+    latest_data = get_season_data(season)['latest_data']
+    path = fixtures_path(season)
+    fixtures = load_fixture_factors(path) if os.path.exists(path) else None
+    return TransferPlanner(latest_data, latest_data['round'].max() + 1, fixtures)
+
+
+def get_transfer_planner(season):
+    """Planner for a season; its memo tables live in this process until the season's files change."""
+    signature = season_signature(season)
+    path = fixtures_path(season)
+    if os.path.exists(path):
+        stat = os.stat(path)
+        signature += (stat.st_size, stat.st_mtime_ns)
+    return local_cache.get_or_build(f'planner:{season}', signature, lambda: build_transfer_planner(season))
+
+
+def plan_transfers(request):
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            squad_ids = [int(player_id) for player_id in data['squad']]
+            bank = price_to_value(data.get('bank', 0))
+            free_transfers = int(data.get('free_transfers', 1))
+            horizon = int(data.get('horizon', 5))
+            max_transfers = int(data.get('max_transfers', 2))
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON format'}, status=400)
+        except (KeyError, TypeError, ValueError):
+            return JsonResponse({'error': 'Expected squad (15 player ids), bank, free_transfers, '
+                                          'horizon and max_transfers'}, status=400)
+        if not 1 <= horizon <= MAX_HORIZON or max_transfers not in (0, 1, 2) or bank < 0 or free_transfers < 0:
+            return JsonResponse({'error': f'horizon must be 1-{MAX_HORIZON}, max_transfers 0-2 '
+                                          f'and bank and free_transfers non-negative'}, status=400)
+
+        try:
+            planner = get_transfer_planner(CURRENT_SEASON)
+            error = planner.validate_squad(squad_ids)
+            if error:
+                return JsonResponse({'error': error}, status=400)
+            return JsonResponse(planner.plan(squad_ids, bank, free_transfers, horizon, max_transfers))
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+
+    return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
@@ -0,0 +1,192 @@
+import heapq
+import math
+import numpy as np
+import pandas as pd
+from django.http import JsonResponse
+from django.views import View
+
+from .cache import season_cache
+from .recomender import CURRENT_SEASON, get_season_data, price_to_value, season_paths, season_signature
+from .views import expected_features, predict_normalized_ratings
+
+POSITION_IDS = {'GK': 1, 'DEF': 2, 'MID': 3, 'FWD': 4}
+
+# Width of a price band in the index, in the same units as `value` (0.5m)
+PRICE_BAND = 5
+
+# Response keys, camelCase like clean_column_names uses for /recommend-team
+RECORD_COLUMNS = {
+    'first_name': 'firstName', 'second_name': 'lastName', 'element_type': 'position', 'team': 'teamId',
+    'value': 'price', 'form_points': 'formPoints', 'predicted_rating': 'predictedRating',
+    'points_per_value': 'pointsPerValue', 'position_score': 'positionScore',
+}
+
+# Columns a projection query can be sorted by
+SORT_KEYS = ['formPoints', 'predictedRating', 'pointsPerValue', 'positionScore']
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 200
+
+
+def build_projection_table(latest_data, raw_stats_df):
+    """Project every player in the prepared season data.
+
+    The rating model is fed each player's season totals from players_raw.csv;
+    form points and points per value come from the prepared latest data.
+    Columns are renamed to the camelCase response keys.
+    """
+    players = latest_data.drop_duplicates('id')[
+        ['id', 'first_name', 'second_name', 'element_type', 'team', 'value', 'average_total_points']
+    ].reset_index(drop=True)
+
+    model_features = [feature for feature in expected_features if feature != 'price']
+    totals = raw_stats_df.drop_duplicates('id').set_index('id')[model_features]
+    features = players[['id']].join(totals, on='id')[model_features]
+
+    element_types = players['element_type'].map(POSITION_IDS)
+    predictable = (features.notna().all(axis=1) & element_types.notna() & (players['value'] > 0)).to_numpy()
+    ratings = np.full(len(players), np.nan)
+    if predictable.any():
+        ratings[predictable] = predict_normalized_ratings(
+            features[predictable], element_types[predictable], players['value'][predictable] / 10
+        )
+
+    table = players.rename(columns={'average_total_points': 'form_points'})
+    table['predicted_rating'] = np.round(ratings, 2)
+    table['points_per_value'] = (table['form_points'] / table['value']).round(4)
+
+    # Form points scaled to 0-100 within each position
+    by_position = table.groupby('element_type', observed=True)['form_points']
+    low, high = by_position.transform('min'), by_position.transform('max')
+    table['position_score'] = (100 * (table['form_points'] - low) / (high - low).replace(0, np.nan)).fillna(100).round(2)
+    return table.rename(columns=RECORD_COLUMNS)
+
+
+class ProjectionIndex:
+    """Read-only index over a projection table.
+
+    Records are kept as plain dicts. For every sort key the players are
+    bucketed by position and price band, each bucket sorted best-first, so a
+    top-N query merges only the buckets inside the price range and stops
+    after N matches.
+    """
+
+    def __init__(self, table):
+        self.records = []
+        for row in table.to_dict(orient='records'):
+            self.records.append({key: (None if isinstance(value, float) and math.isnan(value) else value)
+                                 for key, value in row.items()})
+        self.by_id = {record['id']: record for record in self.records}
+
+        self._keys = {}
+        self._buckets = {}
+        self._by_team = {}
+        for sort in SORT_KEYS:
+            keys = [record[sort] if record[sort] is not None else -math.inf for record in self.records]
+            order = sorted(range(len(self.records)), key=lambda i: keys[i], reverse=True)
+            self._keys[sort] = keys
+            buckets = {}
+            teams = {}
+            for i in order:
+                record = self.records[i]
+                band = int(record['price'] // PRICE_BAND)
+                buckets.setdefault(record['position'], {}).setdefault(band, []).append(i)
+                teams.setdefault(record['teamId'], []).append(i)
+            self._buckets[sort] = buckets
+            self._by_team[sort] = teams
+
+    def get(self, player_id):
+        return self.by_id.get(player_id)
+
+    def query(self, position=None, team=None, min_price=None, max_price=None,
+              sort='formPoints', limit=DEFAULT_LIMIT):
+        """Top ``limit`` players matching the filters, best ``sort`` value first.
+
+        Prices are in the same units as ``value`` (tenths of a million).
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f'sort must be one of {SORT_KEYS}')
+        keys = self._keys[sort]
+
+        def in_range(record):
+            return ((min_price is None or record['price'] >= min_price) and
+                    (max_price is None or record['price'] <= max_price) and
+                    (position is None or record['position'] == position) and
+                    (team is None or record['teamId'] == team))
+
+        if team is not None:
+            # A club has a few dozen players; its sorted list is the smallest source
+            candidates = self._by_team[sort].get(team, [])
+        else:
+            low_band = -math.inf if min_price is None else min_price // PRICE_BAND
+            high_band = math.inf if max_price is None else max_price // PRICE_BAND
+            positions = [position] if position is not None else list(self._buckets[sort])
+            sources = [bucket
+                       for pos in positions
+                       for band, bucket in self._buckets[sort].get(pos, {}).items()
+                       if low_band <= band <= high_band]
+            candidates = heapq.merge(*sources, key=lambda i: keys[i], reverse=True)
+
+        results = []
+        for i in candidates:
+            if len(results) >= limit:
+                break
+            if in_range(self.records[i]):
+                results.append(self.records[i])
+        return results
+
+
+def build_projection_index(season):
+    _, raw_data_path, _ = season_paths(season)
+    latest_data = get_season_data(season)['latest_data']
+    model_features = [feature for feature in expected_features if feature != 'price']
+    raw_stats_df = pd.read_csv(raw_data_path, usecols=['id'] + model_features)
+    return ProjectionIndex(build_projection_table(latest_data, raw_stats_df))
+
+
+def get_projection_index(season):
+    """Projection index for a season, rebuilt only when the season's source files change."""
+    signature = season_signature(season)
+    return season_cache.get_or_build(f'projections:{season}', signature, lambda: build_projection_index(season))
+
+
+def _price(value):
+    return None if value is None else price_to_value(value)
+
+
+class ProjectionsView(View):
+    def get(self, request):
+        try:
+            position = request.GET.get('position')
+            if position is not None and position not in POSITION_IDS:
+                raise ValueError(f'position must be one of {list(POSITION_IDS)}')
+            team = int(request.GET['team']) if 'team' in request.GET else None
+            limit = request.GET.get('limit', str(DEFAULT_LIMIT))
+            if not limit.isdigit() or not 1 <= int(limit) <= MAX_LIMIT:
+                raise ValueError(f'limit must be an integer 1-{MAX_LIMIT}')
+            limit = int(limit)
+            min_price = _price(request.GET.get('min_price'))
+            max_price = _price(request.GET.get('max_price'))
+            sort = request.GET.get('sort', 'formPoints')
+            if sort not in SORT_KEYS:
+                raise ValueError(f'sort must be one of {SORT_KEYS}')
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        try:
+            index = get_projection_index(CURRENT_SEASON)
+            players = index.query(position, team, min_price, max_price, sort, limit)
+            return JsonResponse({'players': players, 'count': len(players)})
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+
+
+class PlayerProjectionView(View):
+    def get(self, request, player_id):
+        try:
+            record = get_projection_index(CURRENT_SEASON).get(player_id)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+        if record is None:
+            return JsonResponse({'error': 'Player not found'}, status=404)
+        return JsonResponse(record)
@@ -1,22 +1,107 @@
+import logging
+import math
 import os
+import numpy as np
 import pandas as pd
 from collections import Counter
 from django.http import JsonResponse
 from django.views import View
 from django.conf import settings
+from .cache import season_cache
+from .metrics import record_rows, span
+from .optimizer import DEFAULT_ENGINE, OPTIMIZER_ENGINES, optimize_team
+from .ingest import ingest_gameweeks
+from .store import (downcast_columns, frame_memory, ingest_state_path, load_season_store, save_season_store,
+                    source_signature, store_path)
+
+logger = logging.getLogger(__name__)
 # Base directory for file paths
 # BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 BASE_DIR = settings.BASE_DIR
+SEASONS_DIR = os.path.join(BASE_DIR, 'data', 'Fantasy-Premier-League', 'data')
+CURRENT_SEASON = '2024-25'
+
+# Columns read from each player's gw.csv
+GW_COLUMNS = [
+    'total_points', 'value', 'round', 'minutes', 'starts', 'selected',
+    'goals_scored', 'assists', 'expected_goal_involvements', 'threat',
+    'expected_goals_conceded', 'goals_conceded', 'clean_sheets'
+]
+
+# Narrowest integer type each gw.csv column fits in; floats stay float64 so
+# window sums round exactly as before
+GW_DTYPES = {
+    'total_points': np.int8, 'value': np.int16, 'round': np.int8, 'minutes': np.int16,
+    'starts': np.int8, 'selected': np.int32, 'goals_scored': np.int8, 'assists': np.int8,
+    'goals_conceded': np.int8, 'clean_sheets': np.int8,
+}
+
+# Player dimension columns from players_raw.csv
+POSITION_DTYPE = pd.CategoricalDtype(['GK', 'DEF', 'MID', 'FWD'])
+NAME_COLUMNS = ['second_name', 'first_name']
+
+# Gameweek windows used by prepare_latest_data: form points average the last
+# FORM_WINDOW rounds, the per-player stats cover the last STATS_WINDOW rounds
+FORM_WINDOW = 5
+STATS_WINDOW = 6
+
+# Rebuild prepared data from the saved last rounds plus newly appended gameweeks
+# instead of the whole season (see load_recent_season_data)
+INCREMENTAL_INGEST = getattr(settings, 'INCREMENTAL_INGEST', True)
+
+# Time limit for the exact optimizer engines when a request gives no deadline_ms
+DEFAULT_DEADLINE_MS = getattr(settings, 'RECOMMEND_DEADLINE_MS', 2000)
+
+# Stats emitted by calculate_player_stats, grouped by the positions they apply to
+BASE_STATS = ['minutes_played', 'total_starts', 'avg_selected', 'goals_scored', 'assists']
+ATTACKING_STATS = ['total_xgi', 'avg_threat']
+DEFENSIVE_STATS = ['total_xgc', 'goals_conceded', 'clean_sheets']
+
+
+def season_paths(season):
+    """Return the players directory, players_raw.csv and teams.csv paths for a season."""
+    season_dir = os.path.join(SEASONS_DIR, season)
+    return (os.path.join(season_dir, 'players'),
+            os.path.join(season_dir, 'players_raw.csv'),
+            os.path.join(season_dir, 'teams.csv'))
+
 
 def normalize_name(name):
     """Normalize the name to remove special characters."""
     return ''.join(c for c in name if c.isalnum() or c in [' ', '_'])
 
 
+def load_player_details(raw_data_path):
+    """Player dimension table from players_raw.csv, indexed by id, with categorical position and club."""
+    raw_stats_df = pd.read_csv(raw_data_path, usecols=['element_type', 'team', 'second_name', 'first_name', 'id'])
+    player_details = raw_stats_df.drop_duplicates('id').set_index('id')
+    player_details['element_type'] = pd.Categorical.from_codes(
+        player_details['element_type'].sub(1).where(player_details['element_type'].between(1, 4), -1),
+        dtype=POSITION_DTYPE)
+    player_details['team'] = player_details['team'].astype('category')
+    for col in NAME_COLUMNS:
+        player_details[col] = player_details[col].astype('category')
+    return player_details
+
+
+def attach_player_details(all_player_data, raw_data_path):
+    """Join the player dimension table onto gameweek rows by id.
+
+    Each detail column arrives as a categorical, so a row holds a small code
+    rather than its own copy of the player's names.
+    """
+    player_details = load_player_details(raw_data_path)
+    rows = player_details.index.get_indexer(all_player_data['id'])
+    for col in player_details.columns:
+        codes = player_details[col].cat.codes.to_numpy()[rows]
+        codes[rows < 0] = -1
+        all_player_data[col] = pd.Categorical.from_codes(codes, dtype=player_details[col].dtype)
+    return all_player_data
+
+
 def load_player_data(players_dir, raw_data_path):
     """Load and merge all player data from CSV files."""
-    raw_stats_df = pd.read_csv(raw_data_path, usecols=['element_type', 'team', 'second_name', 'first_name', 'id'])
-    all_player_data = pd.DataFrame()
+    player_frames = []
 
     for player_folder in os.scandir(players_dir):
         if player_folder.is_dir():
@@ -24,21 +109,51 @@ def load_player_data(players_dir, raw_data_path):
             csv_file_path = os.path.join(player_folder, 'gw.csv')
 
             # Include all required columns from gw.csv
-            player_gw_data = pd.read_csv(csv_file_path, usecols=[ 
-                'total_points', 'value', 'round', 'minutes', 'starts', 'selected',
-                'goals_scored', 'assists', 'expected_goal_involvements', 'threat',
-                'expected_goals_conceded', 'goals_conceded', 'clean_sheets'
-            ])
+            player_gw_data = pd.read_csv(csv_file_path, usecols=GW_COLUMNS)
             player_gw_data['id'] = int(player_id)
-            player_details = raw_stats_df[raw_stats_df['id'] == int(player_id)].iloc[0]
+            player_frames.append(player_gw_data)
 
-            for col in player_details.index:
-                player_gw_data[col] = player_details[col]
+    # Concatenate once and join the player details by id
+    all_player_data = downcast_columns(pd.concat(player_frames, ignore_index=True), GW_DTYPES)
+    return attach_player_details(all_player_data, raw_data_path)
 
-            all_player_data = pd.concat([all_player_data, player_gw_data], ignore_index=True)
 
-    all_player_data["element_type"] = all_player_data["element_type"].map({1: 'GK', 2: 'DEF', 3: 'MID', 4: 'FWD'})
-    return all_player_data
+def season_signature(season):
+    """Fingerprint of every source file a season's prepared data depends on."""
+    return source_signature(*season_paths(season))
+
+
+def load_season_data(season, signature=None):
+    """Load a season's merged player data, preferring the compiled store when it is up to date."""
+    players_dir, raw_data_path, _ = season_paths(season)
+    if signature is None:
+        signature = season_signature(season)
+    all_data = load_season_store(store_path(season), signature)
+    if all_data is None:
+        all_data = load_player_data(players_dir, raw_data_path)
+    return all_data
+
+
+def load_recent_season_data(season, save=False):
+    """Merged player data for the rounds prepare_latest_data looks at, ingesting only new gameweeks.
+
+    Requests only read the saved ingest state; the ingest_gameweeks command
+    passes ``save`` to advance it, so concurrent requests never write the file.
+    Returns the frame and the ingest summary (see models.ingest.ingest_gameweeks).
+    """
+    players_dir, raw_data_path, _ = season_paths(season)
+    recent, summary = ingest_gameweeks(players_dir, ingest_state_path(season), GW_COLUMNS,
+                                       max(FORM_WINDOW, STATS_WINDOW), save)
+    return attach_player_details(downcast_columns(recent, GW_DTYPES), raw_data_path), summary
+
+
+def compile_season(season):
+    """Crawl a season's gw.csv tree once and write it to the compiled store."""
+    players_dir, raw_data_path, _ = season_paths(season)
+    signature = season_signature(season)
+    all_data = load_player_data(players_dir, raw_data_path)
+    path = save_season_store(all_data, store_path(season), signature)
+    return path, all_data
 
 
 def calculate_player_stats(player_data, element_type):
@@ -67,10 +182,68 @@ def calculate_player_stats(player_data, element_type):
     return stats
 
 
-def prepare_latest_data(all_data_df):
+def calculate_window_stats(recent_data, element_types):
+    """Vectorized calculate_player_stats for every player in one grouped pass.
+
+    ``recent_data`` holds the gameweek rows inside the stats window and
+    ``element_types`` maps player id to position. Sums are taken over each
+    player's rows in their original order so the results match
+    calculate_player_stats exactly.
+    """
+    ids = recent_data['id'].to_numpy()
+    order = np.argsort(ids, kind='stable')
+    sorted_ids = ids[order]
+    if len(sorted_ids) == 0:
+        return pd.DataFrame(columns=['id'])
+
+    starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+    counts = np.diff(np.r_[starts, len(sorted_ids)])
+
+    # Players with the same number of rows are summed together as the rows of
+    # one 2-D block, which adds values in the same order as Series.sum
+    blocks = [(np.flatnonzero(counts == count), starts[counts == count][:, None] + np.arange(count))
+              for count in np.unique(counts)]
+
+    def window_sum(column, dtype):
+        values = recent_data[column].to_numpy(dtype)[order]
+        sums = np.empty(len(starts), dtype=dtype)
+        for players, rows in blocks:
+            sums[players] = values[rows].sum(axis=1)
+        return sums
+
+    def rounded(values):
+        return [round(float(value), 2) for value in values]
+
+    stats = pd.DataFrame({
+        'id': sorted_ids[starts],
+        'minutes_played': window_sum('minutes', np.int64),
+        'total_starts': window_sum('starts', np.int64),
+        'avg_selected': np.trunc(window_sum('selected', np.float64) / counts).astype(np.int64),
+        'goals_scored': window_sum('goals_scored', np.int64),
+        'assists': window_sum('assists', np.int64),
+        'total_xgi': rounded(window_sum('expected_goal_involvements', np.float64)),
+        'avg_threat': rounded(window_sum('threat', np.float64) / counts),
+        'total_xgc': rounded(window_sum('expected_goals_conceded', np.float64)),
+        'goals_conceded': window_sum('goals_conceded', np.int64),
+        'clean_sheets': window_sum('clean_sheets', np.int64),
+    })
+
+    # Position-specific stats only apply to the matching positions
+    positions = stats['id'].map(element_types)
+    for columns, position_group in ((ATTACKING_STATS, ['MID', 'FWD']), (DEFENSIVE_STATS, ['DEF', 'GK'])):
+        applies = positions.isin(position_group)
+        if not applies.all():
+            stats[columns] = stats[columns].where(applies, axis=0)
+
+    return stats
+
+
+def prepare_latest_data(all_data_df, form_window=None, stats_window=None):
     """Prepare the latest data with form calculations and additional stats."""
+    form_window = FORM_WINDOW if form_window is None else form_window
+    stats_window = STATS_WINDOW if stats_window is None else stats_window
     game_week = all_data_df['round'].max()
-    recent_weeks = all_data_df['round'] > (game_week - 5)
+    recent_weeks = all_data_df['round'] > (game_week - form_window)
     
     # Calculate form points
     form_data = (all_data_df[recent_weeks]
@@ -85,21 +258,32 @@ def prepare_latest_data(all_data_df):
     latest_data['average_total_points'] = round(latest_data['form_points'].fillna(latest_data['total_points']), 2)
     latest_data = latest_data.drop(columns=['form_points'])
 
-    # Calculate additional stats for each player
-    player_stats = []
-    for _, player in latest_data.iterrows():
-        player_recent_data = all_data_df[ 
-            (all_data_df['id'] == player['id']) & 
-            (all_data_df['round'] > game_week - 6)
-        ]
-        stats = calculate_player_stats(player_recent_data, player['element_type'])
-        stats['id'] = player['id']
-        player_stats.append(stats)
-
-    # Merge stats with latest data
-    player_stats_df = pd.DataFrame(player_stats)
+    # Calculate additional stats for every player at once
+    recent_data = all_data_df[all_data_df['round'] > game_week - stats_window]
+    element_types = latest_data.drop_duplicates('id').set_index('id')['element_type']
+    window_stats = calculate_window_stats(recent_data, element_types)
+
+    # One stats row per latest row, with the position-specific columns present
+    # and ordered as they first appear in calculate_player_stats' output
+    stat_columns = list(BASE_STATS)
+    for position in latest_data['element_type'].drop_duplicates():
+        if position in ['MID', 'FWD'] and ATTACKING_STATS[0] not in stat_columns:
+            stat_columns += ATTACKING_STATS
+        if position in ['DEF', 'GK'] and DEFENSIVE_STATS[0] not in stat_columns:
+            stat_columns += DEFENSIVE_STATS
+    player_stats_df = (window_stats.set_index('id')
+                       .reindex(latest_data['id'])
+                       .reset_index()[stat_columns + ['id']])
+
+    # Merge stats with latest data; the window totals replace the single-gameweek
+    # values of the same name instead of producing _x/_y pairs
+    latest_data = latest_data.drop(columns=[col for col in stat_columns if col in latest_data.columns])
     latest_data = latest_data.merge(player_stats_df, on='id', how='left')
 
+    # One row per player from here on, so names gain nothing from being categorical
+    for col in NAME_COLUMNS:
+        if isinstance(latest_data[col].dtype, pd.CategoricalDtype):
+            latest_data[col] = latest_data[col].astype(object)
     return latest_data
 
 
@@ -111,9 +295,15 @@ def select_best_players_for_position(position, count, max_players_per_team, max_
     position_players['points_per_value'] = position_players['average_total_points'] / position_players['value']
     position_players = position_players.sort_values(by='points_per_value', ascending=False)
     selected_players = []
-
-    while count > 0 and not position_players.empty:
-        player = position_players.iloc[0]
+    seen_ids = set()
+
+    # Walk the sorted candidates once instead of re-filtering after each pick
+    for _, player in position_players.iterrows():
+        if count <= 0:
+            break
+        if player['id'] in seen_ids:
+            continue
+        seen_ids.add(player['id'])
         team_id = player['team']
         player_value = player['value']
 
@@ -128,8 +318,6 @@ def select_best_players_for_position(position, count, max_players_per_team, max_
             current_player_ids.append(player['id'])
             count -= 1
 
-        position_players = position_players[position_players['id'] != player['id']]
-
     return selected_players
 
 
@@ -155,8 +343,7 @@ def select_best_team(team_structure, max_players_per_team, max_spend, players_df
 def clean_column_names(team_df):
     """Clean and rename columns to be more user-friendly."""
     columns_to_drop = [
-        'assists_x', 'clean_sheets_x', 'expected_goal_involvements',
-        'expected_goals_conceded', 'goals_conceded_x', 'goals_scored_x',
+        'expected_goal_involvements', 'expected_goals_conceded',
         'minutes', 'round', 'selected', 'starts'
     ]
 
@@ -172,10 +359,10 @@ def clean_column_names(team_df):
         'minutes_played': 'Minutes',
         'total_starts': 'Starts',
         'avg_selected': 'Ownership',
-        'goals_scored_y': 'Goals',
-        'assists_y': 'Assists',
-        'clean_sheets_y': 'CleanSheets',
-        'goals_conceded_y': 'GoalsConceded',
+        'goals_scored': 'Goals',
+        'assists': 'Assists',
+        'clean_sheets': 'CleanSheets',
+        'goals_conceded': 'GoalsConceded',
         'total_xgi': ' XGI',
         'total_xgc': 'XGC',
         'threat': 'threat',
@@ -189,46 +376,197 @@ def clean_column_names(team_df):
     columns_to_drop_other = ['points_per_value']
     cleaned_df.drop(columns=columns_to_drop_other, errors='ignore', inplace=True)
 
+    # Categorical position and club become plain values for the response
+    categorical_columns = cleaned_df.select_dtypes(include=['category']).columns
+    cleaned_df[categorical_columns] = cleaned_df[categorical_columns].astype(object)
+
     # Round numeric columns
     numeric_columns = cleaned_df.select_dtypes(include=['float64']).columns
     cleaned_df[numeric_columns] = cleaned_df[numeric_columns].round(2)
 
     return cleaned_df
 
+def fill_missing(frame, value=0):
+    """``frame.fillna(value)`` with object columns re-inferred explicitly.
+
+    pandas 2.2 deprecates fillna silently downcasting object columns (the
+    categoricals clean_column_names turns into plain values); the result
+    keeps the dtypes it had before.
+    """
+    with pd.option_context('future.no_silent_downcasting', True):
+        return frame.fillna(value).infer_objects(copy=False)
+
+
 def load_teams_data(teams_path):
     """Load team data and create a mapping of teamId to team name."""
     teams_df = pd.read_csv(teams_path, usecols=['id', 'name'])
     team_mapping = dict(zip(teams_df['id'], teams_df['name']))
     return team_mapping
 
+
+def build_season_data(season, signature=None):
+    """Load and prepare everything the recommender needs for a season."""
+    _, _, teams_path = season_paths(season)
+    with span('load'):
+        if INCREMENTAL_INGEST:
+            all_data, _ = load_recent_season_data(season)
+        else:
+            all_data = load_season_data(season, signature)
+    record_rows('load', len(all_data))
+    with span('prepare'):
+        latest_data = prepare_latest_data(all_data)
+    record_rows('prepare', len(latest_data))
+    latest_data.to_csv(os.path.join(BASE_DIR, 'latest_data.csv'), index=False)
+    return {
+        'latest_data': latest_data,
+        'team_mapping': load_teams_data(teams_path),
+    }
+
+
+def get_season_data(season):
+    """Prepared season data, rebuilt only when the season's source files change."""
+    signature = season_signature(season)
+    return season_cache.get_or_build(season, signature, lambda: build_season_data(season, signature))
+
+
+def season_memory_report(season):
+    """Memory footprint of a season's merged and prepared data, in bytes.
+
+    ``all_data_untyped_bytes`` is the same merged frame with object names and
+    positions and int64 columns, the layout used before the typed table.
+    """
+    all_data = load_season_data(season)
+    latest_data = get_season_data(season)['latest_data']
+    untyped = all_data.astype({col: (object if isinstance(dtype, pd.CategoricalDtype) else np.int64)
+                               for col, dtype in all_data.dtypes.items()
+                               if isinstance(dtype, pd.CategoricalDtype) or dtype.kind in 'iu'})
+    return {
+        'season': season,
+        'gameweek_rows': len(all_data),
+        'players': int(all_data['id'].nunique()),
+        'all_data_bytes': frame_memory(all_data),
+        'all_data_untyped_bytes': frame_memory(untyped),
+        'latest_data_bytes': frame_memory(latest_data),
+        'columns': {col: int(size) for col, size in all_data.memory_usage(deep=True, index=False).items()},
+    }
+
+
+class SquadIncompleteError(ValueError):
+    """The optimizer could not fill every squad slot under the budget and club cap."""
+
+
 # Constants
 MAX_PLAYERS_PER_TEAM = 3
 MAX_SPEND = 1000
 TEAM_STRUCTURE = {'GK': 2, 'DEF': 5, 'MID': 5, 'FWD': 3}
 
 
+def price_to_value(price):
+    """A price in £m, the unit every request parameter uses, in FPL `value` units (tenths of a million).
+
+    Raises ValueError for prices that are negative, infinite or NaN.
+    """
+    price = float(price)
+    if not math.isfinite(price) or price < 0:
+        raise ValueError(f'Prices must be finite and non-negative, got {price}')
+    return round(price * 10)
+
+
+def parse_recommend_params(params):
+    """Read the optimizer engine, deadline (seconds) and risk aversion from query parameters.
+
+    Raises ValueError with a client-facing message when they are invalid.
+    """
+    engine = params.get('engine')
+    if engine is not None and engine not in OPTIMIZER_ENGINES:
+        raise ValueError(f'Unknown engine, expected one of {sorted(OPTIMIZER_ENGINES)}')
+    try:
+        deadline = float(params['deadline_ms']) / 1000 if 'deadline_ms' in params else None
+    except ValueError:
+        raise ValueError('deadline_ms must be a number')
+    if deadline is not None and not (math.isfinite(deadline) and deadline > 0):
+        raise ValueError('deadline_ms must be a positive number')
+    if deadline is None and engine not in (None, DEFAULT_ENGINE):
+        # Exact engines always run against a time limit on the request path
+        deadline = DEFAULT_DEADLINE_MS / 1000
+    try:
+        risk = float(params['risk']) if 'risk' in params else None
+    except ValueError:
+        raise ValueError('risk must be a number')
+    if risk is not None and not (math.isfinite(risk) and risk >= 0):
+        raise ValueError('risk must be a non-negative number')
+    return engine, deadline, risk
+
+
+def recommend_team(engine=None, deadline=None, season=CURRENT_SEASON, risk=None):
+    """Build the /recommend-team payload for a season.
+
+    With ``risk`` the squad maximizes simulated points minus ``risk`` times
+    their variance instead of average_total_points, and the payload carries
+    the chosen squad's simulated distribution.
+    """
+    # Load and prepare data (cached until the season's files change)
+    with span('season_data'):
+        season_data = get_season_data(season)
+    latest_data = season_data['latest_data']
+    team_mapping = season_data['team_mapping']
+    objective = simulator = None
+    if risk is not None:
+        from .simulation import get_squad_simulator, risk_adjusted_points
+
+        with span('simulate'):
+            simulator = get_squad_simulator(season)
+            objective = risk_adjusted_points(latest_data, simulator, risk)
+    # Generate best team with the requested optimizer engine
+    with span('optimize'):
+        team_df, optimizer_info = optimize_team(latest_data, TEAM_STRUCTURE, MAX_PLAYERS_PER_TEAM,
+                                                MAX_SPEND, engine, deadline, objective)
+    record_rows('optimize', len(latest_data))
+    if not optimizer_info['complete']:
+        raise SquadIncompleteError('Could not fill a full squad within the budget and per-team cap')
+    simulation = None
+    if simulator is not None:
+        with span('simulate'):
+            squad_ids = [player_id for player_id in team_df['id'].tolist() if player_id in simulator.index]
+            simulation = simulator.simulate(squad_ids, seed=0) if squad_ids else None
+            if simulation is not None:
+                simulation['risk'] = risk
+    with span('format'):
+        total_points = round(float(team_df['average_total_points'].sum()), 2)
+        total_spend = round(float(team_df['value'].sum()), 2)
+        cleaned_team_df = clean_column_names(team_df)
+        cleaned_team_df = fill_missing(cleaned_team_df)
+        cleaned_team_df['teamName'] = cleaned_team_df['teamId'].map(team_mapping)
+        cleaned_team_df.drop(columns=['teamId'], inplace=True)
+        team = cleaned_team_df.to_dict(orient='records')
+    payload = {'team': team,
+               'total_points': total_points,
+               'total_spend': total_spend,
+               'optimizer': optimizer_info}
+    if simulation is not None:
+        payload['simulation'] = simulation
+    return payload
+
+
 class RecommendTeamView(View):
     def get(self, request):
-        players_dir = os.path.join(BASE_DIR, 'data', 'Fantasy-Premier-League/data/2024-25/players/')
-        raw_data_path = os.path.join(BASE_DIR, 'data', 'Fantasy-Premier-League/data/2024-25/players_raw.csv')
-        teams_path = os.path.join(BASE_DIR, 'data', 'Fantasy-Premier-League/data/2024-25/teams.csv')
-        
         try:
-            # Load and prepare data
-            all_data = load_player_data(players_dir, raw_data_path)
-            latest_data = prepare_latest_data(all_data)
-            team_mapping = load_teams_data(teams_path)
-            latest_data.to_csv(os.path.join(BASE_DIR, 'latest_data.csv'), index=False)
-            # Generate best team
-            team_df = select_best_team(TEAM_STRUCTURE, MAX_PLAYERS_PER_TEAM, MAX_SPEND, latest_data)
-            total_points = round(float(team_df['average_total_points'].sum()), 2)
-            total_spend = round(float(team_df['value'].sum()), 2)
-            cleaned_team_df = clean_column_names(team_df)
-            cleaned_team_df = cleaned_team_df.fillna(0)
-            cleaned_team_df['teamName'] = cleaned_team_df['teamId'].map(team_mapping)
-            cleaned_team_df.drop(columns=['teamId'], inplace=True)
-            return JsonResponse({'team': cleaned_team_df.to_dict(orient='records'),
-                                 'total_points': total_points,
-                                 'total_spend': total_spend})
+            engine, deadline, risk = parse_recommend_params(request.GET)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        try:
+            # Rendered once per data version and parameters; repeat callers get bytes or a 304
+            from .snapshots import get_recommend_snapshot
+
+            return get_recommend_snapshot(engine, deadline, risk).response(request)
+        except SquadIncompleteError as e:
+            return JsonResponse({'error': str(e)}, status=400)
         except Exception as e:
+            logger.exception('recommend-team failed')
             return JsonResponse({'error': str(e)}, status=500)
+
+
+class SeasonCacheStatsView(View):
+    def get(self, request):
+        return JsonResponse(season_cache.stats())
@@ -0,0 +1,82 @@
+import os
+import threading
+import time
+import joblib
+from django.conf import settings
+
+MODELS_DIR = os.path.join(settings.BASE_DIR, 'trained_models')
+
+# Artifact name -> file in trained_models/
+ARTIFACTS = {
+    'rating_model': 'fpl_linear_model.pkl',     # served by /predict-rating
+    'rating_forest': 'fpl_rating_model.pkl',    # random forest written by ratings.ipynb
+    'scaler': 'scaler.pkl',                     # feature scaler for rating_forest
+    'points_scaler': 'fpl_scaler.pkl',
+    'min_max_points': 'min_max_points.pkl',     # per-position points range used to normalize ratings
+}
+
+
+class ModelRegistry:
+    """Loads trained artifacts on first use and keeps them for the life of the process.
+
+    With ``mmap_mode='r'`` large numpy arrays inside an artifact are memory
+    mapped instead of copied, so workers forked from the same files share
+    those pages.
+    """
+
+    def __init__(self, directory, artifacts, mmap_mode=None):
+        self.directory = directory
+        self.artifacts = dict(artifacts)
+        self.mmap_mode = mmap_mode
+        self._loaded = {}
+        self._load_ms = {}
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        if name not in self.artifacts:
+            raise KeyError(f'Unknown model artifact: {name}')
+        return os.path.join(self.directory, self.artifacts[name])
+
+    def get(self, name):
+        """Return the loaded artifact, loading it now if this is the first use."""
+        if name in self._loaded:
+            return self._loaded[name]
+
+        with self._lock:
+            if name not in self._loaded:
+                path = self.path(name)
+                start = time.perf_counter()
+                self._loaded[name] = joblib.load(path, mmap_mode=self.mmap_mode)
+                self._load_ms[name] = round((time.perf_counter() - start) * 1000, 2)
+        return self._loaded[name]
+
+    def warm_up(self, names=None):
+        """Load the given artifacts (default: every one present on disk) and return the report."""
+        for name in names or self.artifacts:
+            if names or os.path.exists(self.path(name)):
+                self.get(name)
+        return self.report()
+
+    def report(self):
+        """Per-artifact file size, load state and load time."""
+        report = []
+        for name, filename in self.artifacts.items():
+            path = self.path(name)
+            exists = os.path.exists(path)
+            report.append({
+                'name': name,
+                'file': filename,
+                'exists': exists,
+                'size_bytes': os.path.getsize(path) if exists else None,
+                'loaded': name in self._loaded,
+                'load_ms': self._load_ms.get(name),
+            })
+        return report
+
+
+registry = ModelRegistry(MODELS_DIR, ARTIFACTS, getattr(settings, 'MODEL_MMAP_MODE', None))
+
+
+def get_artifact(name):
+    """Shortcut for ``registry.get(name)``."""
+    return registry.get(name)
@@ -0,0 +1,90 @@
+import copy
+import os
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+POSITION_IDS = {'GK': 1, 'DEF': 2, 'MID': 3, 'FWD': 4}
+
+# Points per unit of each stat by element_type. Index 0 covers anything
+# outside 1-4, which only scores the terms shared by every position.
+# A unit > 1 floors the stat first (a point per 60 minutes, per 3 saves).
+DEFAULT_RULES = {
+    'units': {'minutes': 60, 'saves': 3},
+    'points': {
+        #                 ?, GK, DEF, MID, FWD
+        'minutes':      [1, 1, 1, 1, 1],
+        'goals_scored': [0, 6, 6, 5, 4],
+        'assists':      [1, 1, 1, 4, 4],
+        'clean_sheets': [0, 4, 4, 1, 0],
+        'saves':        [0, 1, 0, 0, 0],
+        'bonus':        [1, 1, 1, 1, 1],
+        'yellow_cards': [-1, -1, -1, -1, -1],
+        'red_cards':    [-2, -2, -2, -2, -2],
+    },
+}
+
+# Per-season changes to DEFAULT_RULES, e.g.
+# {'2025-26': {'points': {'clean_sheets': [0, 4, 4, 1, 0]}, 'units': {'saves': 3}}}
+SEASON_RULES = getattr(settings, 'SCORING_RULES', {})
+
+
+def scoring_rules(season=None):
+    """DEFAULT_RULES with the season's overrides from SEASON_RULES applied."""
+    rules = copy.deepcopy(DEFAULT_RULES)
+    overrides = SEASON_RULES.get(season, {})
+    rules['units'].update(overrides.get('units', {}))
+    rules['points'].update(overrides.get('points', {}))
+    return rules
+
+
+def position_index(element_type):
+    """Row of the rules table for each player: element_type 1-4, or names GK/DEF/MID/FWD; anything else is 0."""
+    codes = np.asarray(element_type)
+    if codes.dtype.kind not in 'iuf':
+        codes = pd.to_numeric(pd.Series(codes, dtype=object).map(lambda code: POSITION_IDS.get(code, code)),
+                              errors='coerce').to_numpy()
+    codes = np.nan_to_num(codes.astype(np.float64), nan=0).astype(np.int64)
+    return np.where((codes >= 1) & (codes <= 4), codes, 0)
+
+
+def score_points(data, rules=None):
+    """FPL points for every row of a DataFrame (or dict of equal-length arrays).
+
+    Each stat is multiplied by its coefficient looked up for the row's
+    position, so the work is one array operation per stat whatever the
+    number of rows. Stats missing from ``data`` score nothing. Returns an
+    ndarray, integer when the inputs are.
+    """
+    rules = rules or DEFAULT_RULES
+    positions = position_index(data['element_type'])
+    total = np.zeros(len(positions), dtype=np.int64)
+    for stat, coefficients in rules['points'].items():
+        if stat not in data:
+            continue
+        values = np.asarray(data[stat])
+        unit = rules['units'].get(stat, 1)
+        if unit != 1:
+            values = values // unit
+        total = total + values * np.asarray(coefficients)[positions]
+    return total
+
+
+def score_history_seasons(history_dir=None):
+    """Recompute every bundled season's points from data/players_<season>.csv under that season's rules.
+
+    Returns one row per player and season with the file's total_points next
+    to the recomputed calculated_points. Seasons without a saves column score
+    no save points.
+    """
+    from .history import HISTORY_DIR, POSITIONS, history_seasons
+
+    history_dir = history_dir or HISTORY_DIR
+    frames = []
+    for season in history_seasons(history_dir):
+        players = pd.read_csv(os.path.join(history_dir, f'players_{season}.csv'))
+        players['element_type'] = players['position'].replace(POSITIONS)
+        players['calculated_points'] = score_points(players, scoring_rules(season))
+        players['season'] = season
+        frames.append(players[['season', 'name', 'element_type', 'total_points', 'calculated_points']])
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,133 @@
+import numpy as np
+from django.http import JsonResponse
+from django.views import View
+
+from .cache import season_cache
+from .recomender import (ATTACKING_STATS, CURRENT_SEASON, DEFENSIVE_STATS, clean_column_names, get_season_data,
+                         price_to_value, season_signature)
+
+# Stats compared per position; prepare_latest_data only fills the attacking
+# stats for MID/FWD and the defensive ones for GK/DEF
+COMMON_FEATURES = ['minutes_played', 'average_total_points']
+SIMILARITY_FEATURES = {
+    'GK': COMMON_FEATURES + DEFENSIVE_STATS,
+    'DEF': COMMON_FEATURES + DEFENSIVE_STATS,
+    'MID': COMMON_FEATURES + ATTACKING_STATS,
+    'FWD': COMMON_FEATURES + ATTACKING_STATS,
+}
+
+DEFAULT_NEIGHBOURS = 5
+MAX_NEIGHBOURS = 50
+
+
+class SimilarityIndex:
+    """Per-position KD-trees over standardized player stats, built once per data version.
+
+    Features are z-scored within the position, so every stat weighs the same
+    in the Euclidean distance. Price and club filters are applied to the
+    nearest candidates, widening the search until enough pass.
+    """
+
+    def __init__(self, latest_data, team_mapping):
+        # scipy is imported here so routing to this view does not load it at startup
+        from scipy.spatial import cKDTree
+
+        players = latest_data.drop_duplicates('id')
+        self.trees = {}
+        self.members = {}
+        self.location = {}
+        for position, features in SIMILARITY_FEATURES.items():
+            group = players[players['element_type'] == position]
+            if group.empty:
+                continue
+            values = group[features].to_numpy(np.float64)
+            values = np.nan_to_num(values - np.nanmean(values, axis=0))
+            scale = values.std(axis=0)
+            self.trees[position] = cKDTree(values / np.where(scale > 0, scale, 1))
+            self.members[position] = group['id'].to_numpy()
+            self.location.update({player_id: (position, i) for i, player_id in enumerate(group['id'].tolist())})
+
+        self.value = dict(zip(players['id'].tolist(), players['value'].tolist()))
+        self.team = dict(zip(players['id'].tolist(), players['team'].astype(object).tolist()))
+        records = clean_column_names(players.copy())
+        records['teamName'] = records['teamId'].map(team_mapping)
+        records = records[['id', 'firstName', 'lastName', 'position', 'teamId', 'teamName', 'price', 'Avg Points']]
+        self.records = {record['id']: record for record in records.to_dict(orient='records')}
+
+    def similar(self, player_id, k=DEFAULT_NEIGHBOURS, max_price=None, min_price=None, teams=None,
+                exclude_teams=None):
+        """The ``k`` players of the same position closest to ``player_id`` that pass the filters.
+
+        Prices are in `value` units. Returns a list of (player id, distance),
+        nearest first, or None when the player is not indexed.
+        """
+        if player_id not in self.location:
+            return None
+        position, row = self.location[player_id]
+        tree = self.trees[position]
+        members = self.members[position]
+        point = tree.data[row]
+
+        def keep(candidate):
+            value = self.value[candidate]
+            return (candidate != player_id
+                    and (max_price is None or value <= max_price)
+                    and (min_price is None or value >= min_price)
+                    and (teams is None or self.team[candidate] in teams)
+                    and (exclude_teams is None or self.team[candidate] not in exclude_teams))
+
+        wanted = min(k + 1, tree.n)
+        while True:
+            distances, rows = tree.query(point, k=wanted)
+            distances, rows = np.atleast_1d(distances), np.atleast_1d(rows)
+            matches = [(int(members[i]), float(d)) for d, i in zip(distances, rows) if keep(members[i])]
+            if len(matches) >= k or wanted == tree.n:
+                return matches[:k]
+            wanted = min(wanted * 4, tree.n)
+
+
+def get_similarity_index(season=CURRENT_SEASON):
+    """Similarity index for a season, rebuilt only when its source files change."""
+    signature = season_signature(season)
+
+    def build():
+        season_data = get_season_data(season)
+        return SimilarityIndex(season_data['latest_data'], season_data['team_mapping'])
+
+    return season_cache.get_or_build(f'similarity:{season}', signature, build)
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',') if item.strip()] if value else None
+
+
+class SimilarPlayersView(View):
+    def get(self, request, player_id):
+        try:
+            k = int(request.GET.get('k', DEFAULT_NEIGHBOURS))
+            # Prices in £m, like every other endpoint's parameters
+            max_price = price_to_value(request.GET['max_price']) if 'max_price' in request.GET else None
+            min_price = price_to_value(request.GET['min_price']) if 'min_price' in request.GET else None
+            teams = _int_list(request.GET.get('teams'))
+            exclude_teams = _int_list(request.GET.get('exclude_teams'))
+        except ValueError:
+            return JsonResponse({'error': 'k must be an integer, max_price/min_price numbers and '
+                                          'teams/exclude_teams comma separated team ids'}, status=400)
+        if not 1 <= k <= MAX_NEIGHBOURS:
+            return JsonResponse({'error': f'k must be 1-{MAX_NEIGHBOURS}'}, status=400)
+
+        try:
+            index = get_similarity_index()
+            if request.GET.get('cheaper') == '1' and player_id in index.value:
+                limit = index.value[player_id] - 1
+                max_price = limit if max_price is None else min(max_price, limit)
+            matches = index.similar(player_id, k, max_price, min_price, teams, exclude_teams)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+        if matches is None:
+            return JsonResponse({'error': 'Player not found'}, status=404)
+        return JsonResponse({
+            'player': index.records[player_id],
+            'similar': [{**index.records[candidate], 'distance': round(distance, 4)}
+                        for candidate, distance in matches],
+        })
@@ -0,0 +1,223 @@
+import json
+import threading
+import numpy as np
+import pandas as pd
+from django.http import JsonResponse
+
+from .cache import local_cache
+from .recomender import CURRENT_SEASON, TEAM_STRUCTURE, load_season_data, season_signature
+from .scoring import POSITION_IDS, score_points, scoring_rules
+
+
+# Gameweeks of the position average blended into every player's rates, so a
+# few appearances do not produce extreme distributions
+PRIOR_GAMES = 3
+
+# Minutes standing in for a substitute and a full appearance when scoring
+SUB_MINUTES = 30
+FULL_MINUTES = 90
+
+DEFAULT_SIMULATIONS = 10000
+MAX_SIMULATIONS = 100000
+
+# A squad is at most the 15 players of a full FPL squad, which bounds the
+# (simulations x players) arrays a request can allocate
+MAX_SQUAD_SIZE = sum(TEAM_STRUCTURE.values())
+
+# Simulations used for the per-player moments behind the optimizer objective
+MOMENT_SIMULATIONS = 4000
+
+
+def scoring_weights(rules=None):
+    """Per-position points for each simulated event under the scoring rules.
+
+    Returns a dict of arrays indexed by position id (1-4): points for a
+    substitute and a full appearance, and per goal, assist and clean sheet.
+    """
+    positions = {'element_type': np.arange(5)}
+
+    def gained(stat, value):
+        return score_points({**positions, stat: np.full(5, value)}, rules).astype(np.float64)
+
+    return {
+        'sub': gained('minutes', SUB_MINUTES),
+        'start': gained('minutes', FULL_MINUTES),
+        'goal': gained('goals_scored', 1),
+        'assist': gained('assists', 1),
+        'clean_sheet': gained('clean_sheets', 1),
+    }
+
+
+def fit_player_distributions(all_data_df):
+    """Per-player gameweek distributions from merged gw.csv rows.
+
+    Appearances are split into starts (60+ minutes) and substitute outings;
+    goals and assists are Poisson per appearance and clean sheets Bernoulli
+    per start. Every rate is shrunk towards its position average by
+    PRIOR_GAMES gameweeks.
+    """
+    rows = all_data_df[['id', 'element_type', 'minutes', 'goals_scored', 'assists', 'clean_sheets']].copy()
+    rows['element_type'] = rows['element_type'].astype(object).map(POSITION_IDS)
+    rows = rows.dropna(subset=['element_type'])
+    rows['started'] = rows['minutes'] >= 60
+    rows['subbed'] = (rows['minutes'] > 0) & ~rows['started']
+    rows['played'] = rows['minutes'] > 0
+    rows['clean_sheets'] = rows['clean_sheets'].where(rows['started'], 0)
+
+    totals = rows.groupby('id').agg(
+        element_type=('element_type', 'first'), gameweeks=('minutes', 'size'),
+        starts=('started', 'sum'), subs=('subbed', 'sum'), appearances=('played', 'sum'),
+        goals=('goals_scored', 'sum'), assists=('assists', 'sum'), clean_sheets=('clean_sheets', 'sum'))
+
+    by_position = totals.groupby('element_type')[['gameweeks', 'starts', 'subs', 'appearances',
+                                                  'goals', 'assists', 'clean_sheets']].sum()
+    prior = pd.DataFrame({
+        'p_start': by_position['starts'] / by_position['gameweeks'],
+        'p_sub': by_position['subs'] / by_position['gameweeks'],
+        'goal_rate': by_position['goals'] / by_position['appearances'].clip(lower=1),
+        'assist_rate': by_position['assists'] / by_position['appearances'].clip(lower=1),
+        'cs_rate': by_position['clean_sheets'] / by_position['starts'].clip(lower=1),
+    }).reindex(totals['element_type']).set_axis(totals.index)
+
+    def shrunk(count, exposure, column):
+        return (count + PRIOR_GAMES * prior[column]) / (exposure + PRIOR_GAMES)
+
+    return pd.DataFrame({
+        'element_type': totals['element_type'].astype(np.int64),
+        'p_start': shrunk(totals['starts'], totals['gameweeks'], 'p_start'),
+        'p_sub': shrunk(totals['subs'], totals['gameweeks'], 'p_sub'),
+        'goal_rate': shrunk(totals['goals'], totals['appearances'], 'goal_rate'),
+        'assist_rate': shrunk(totals['assists'], totals['appearances'], 'assist_rate'),
+        'cs_rate': shrunk(totals['clean_sheets'], totals['starts'], 'cs_rate'),
+    })
+
+
+class SquadSimulator:
+    """Samples gameweek points for any set of players, all simulations at once.
+
+    Every draw is one NumPy call over a (simulations x players) array, so the
+    cost grows with the number of samples rather than with Python loops.
+    """
+
+    def __init__(self, distributions, weights=None):
+        weights = weights or scoring_weights()
+        self.index = {player_id: i for i, player_id in enumerate(distributions.index.tolist())}
+        position = distributions['element_type'].to_numpy()
+        self.p_start = distributions['p_start'].to_numpy(np.float64)
+        self.p_sub = distributions['p_sub'].to_numpy(np.float64)
+        self.goal_rate = distributions['goal_rate'].to_numpy(np.float64)
+        self.assist_rate = distributions['assist_rate'].to_numpy(np.float64)
+        self.cs_rate = distributions['cs_rate'].to_numpy(np.float64)
+        self.sub_points = weights['sub'][position]
+        self.start_points = weights['start'][position]
+        self.goal_points = weights['goal'][position]
+        self.assist_points = weights['assist'][position]
+        self.cs_points = weights['clean_sheet'][position]
+        self._moments = None
+        self._lock = threading.Lock()
+
+    def rows(self, player_ids):
+        """Simulator rows for player ids; raises KeyError naming the unknown ones."""
+        unknown = [player_id for player_id in player_ids if player_id not in self.index]
+        if unknown:
+            raise KeyError(f'No gameweek history for players: {unknown}')
+        return np.array([self.index[player_id] for player_id in player_ids], dtype=np.int64)
+
+    def sample(self, rows, simulations, rng):
+        """Points matrix of shape (simulations, len(rows))."""
+        shape = (simulations, len(rows))
+        minutes_draw = rng.random(shape)
+        started = minutes_draw < self.p_start[rows]
+        played = minutes_draw < self.p_start[rows] + self.p_sub[rows]
+
+        goals = rng.poisson(self.goal_rate[rows], shape) * played
+        assists = rng.poisson(self.assist_rate[rows], shape) * played
+        clean_sheets = (rng.random(shape) < self.cs_rate[rows]) & started
+
+        return (np.where(started, self.start_points[rows], np.where(played, self.sub_points[rows], 0.0))
+                + goals * self.goal_points[rows]
+                + assists * self.assist_points[rows]
+                + clean_sheets * self.cs_points[rows])
+
+    def simulate(self, player_ids, simulations=DEFAULT_SIMULATIONS, threshold=None, seed=None):
+        """Distribution of the squad's total gameweek points over ``simulations`` samples."""
+        rows = self.rows(player_ids)
+        points = self.sample(rows, simulations, np.random.default_rng(seed))
+        totals = points.sum(axis=1)
+        summary = {
+            'simulations': simulations,
+            'expected_points': round(float(totals.mean()), 2),
+            'variance': round(float(totals.var()), 2),
+            'std': round(float(totals.std()), 2),
+            'percentiles': {str(q): round(float(value), 2)
+                            for q, value in zip((5, 25, 50, 75, 95), np.percentile(totals, (5, 25, 50, 75, 95)))},
+            'players': [{'id': player_id, 'expected_points': round(float(mean), 2), 'std': round(float(std), 2)}
+                        for player_id, mean, std in zip(player_ids, points.mean(axis=0), points.std(axis=0))],
+        }
+        if threshold is not None:
+            summary['threshold'] = threshold
+            summary['probability_above'] = round(float((totals > threshold).mean()), 4)
+        return summary
+
+    def moments(self):
+        """Simulated mean and variance of every player's gameweek points, computed once."""
+        with self._lock:
+            if self._moments is None:
+                points = self.sample(np.arange(len(self.index)), MOMENT_SIMULATIONS, np.random.default_rng(0))
+                self._moments = pd.DataFrame({'mean': points.mean(axis=0), 'variance': points.var(axis=0)},
+                                             index=list(self.index))
+        return self._moments
+
+
+def risk_adjusted_points(players_df, simulator, risk_aversion):
+    """Per-player objective ``mean - risk_aversion * variance`` for the optimizer.
+
+    Players are simulated independently, so a squad's variance is the sum of
+    its players' and this stays a linear objective every engine can maximize.
+    Players without history fall back to their average_total_points.
+    """
+    moments = simulator.moments().reindex(players_df['id'])
+    score = moments['mean'] - risk_aversion * moments['variance']
+    return pd.Series(score.to_numpy(), index=players_df.index).fillna(players_df['average_total_points'])
+
+
+def build_squad_simulator(season):
+    return SquadSimulator(fit_player_distributions(load_season_data(season)), scoring_weights(scoring_rules(season)))
+
+
+def get_squad_simulator(season):
+    """Simulator fitted to a season's full gameweek history, refitted when its files change.
+
+    Kept in this process: it holds a lock and the memoized per-player moments.
+    """
+    signature = season_signature(season)
+    return local_cache.get_or_build(f'simulation:{season}', signature, lambda: build_squad_simulator(season))
+
+
+def simulate_squad(request):
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            squad_ids = [int(player_id) for player_id in data['squad']]
+            simulations = int(data.get('simulations', DEFAULT_SIMULATIONS))
+            threshold = float(data['threshold']) if data.get('threshold') is not None else None
+            seed = int(data['seed']) if data.get('seed') is not None else None
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON format'}, status=400)
+        except (KeyError, TypeError, ValueError):
+            return JsonResponse({'error': 'Expected squad (player ids), and optionally simulations, '
+                                          'threshold and seed'}, status=400)
+        if not 1 <= len(squad_ids) <= MAX_SQUAD_SIZE or len(set(squad_ids)) != len(squad_ids):
+            return JsonResponse({'error': f'squad must be 1-{MAX_SQUAD_SIZE} distinct player ids'}, status=400)
+        if not 1 <= simulations <= MAX_SIMULATIONS:
+            return JsonResponse({'error': f'simulations must be 1-{MAX_SIMULATIONS}'}, status=400)
+
+        try:
+            simulator = get_squad_simulator(CURRENT_SEASON)
+            return JsonResponse(simulator.simulate(squad_ids, simulations, threshold, seed))
+        except KeyError as e:
+            return JsonResponse({'error': e.args[0]}, status=400)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+
+    return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
@@ -0,0 +1,97 @@
+import gzip
+import hashlib
+import json
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always offered
+    brotli = None
+
+from .cache import LRUBackend, SeasonDataCache
+from .metrics import span
+from .recomender import CURRENT_SEASON, recommend_team, season_signature
+
+# Rendered payloads kept per process, one per (season, engine, deadline, risk)
+MAX_SNAPSHOTS = getattr(settings, 'RECOMMEND_SNAPSHOTS', 16)
+GZIP_LEVEL = 6
+
+# Compressed encodings offered, most preferred first when the client weighs them equally
+ENCODINGS = ('br', 'gzip')
+
+# Separate from season_cache so snapshots never evict prepared seasons
+snapshot_cache = SeasonDataCache(LRUBackend(MAX_SNAPSHOTS))
+
+
+def accepted_encodings(accept_encoding):
+    """Quality value per coding in an Accept-Encoding header: 'gzip;q=0.5, br' -> {'gzip': 0.5, 'br': 1.0}."""
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, *params = [item.strip() for item in part.split(';')]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities
+
+
+class Snapshot:
+    """A payload rendered once to JSON bytes, with compressed copies and one strong ETag per encoding."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        body = json.dumps(payload, cls=DjangoJSONEncoder).encode()
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.bodies = {None: body, 'gzip': gzip.compress(body, GZIP_LEVEL, mtime=0)}
+        if brotli is not None:
+            self.bodies['br'] = brotli.compress(body)
+        self.etags = {encoding: f'"{digest}-{encoding}"' if encoding else f'"{digest}"' for encoding in self.bodies}
+
+    def negotiate(self, accept_encoding):
+        """The accepted encoding with the highest q-value; q=0 rules one out and '*' covers unlisted ones."""
+        qualities = accepted_encodings(accept_encoding)
+        best, best_quality = None, 0.0
+        for encoding in ENCODINGS:
+            quality = qualities.get(encoding, qualities.get('*', 0.0))
+            if encoding in self.bodies and quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def response(self, request):
+        """200 with the best encoding the client accepts, or 304 when it already holds this version."""
+        encoding = self.negotiate(request.headers.get('Accept-Encoding', ''))
+        client_etags = parse_etags(request.headers.get('If-None-Match', ''))
+        if '*' in client_etags or set(client_etags) & set(self.etags.values()):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(self.bodies[encoding], content_type='application/json')
+            if encoding:
+                response['Content-Encoding'] = encoding
+        response['ETag'] = self.etags[encoding]
+        response['Cache-Control'] = 'no-cache'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+
+def build_recommend_snapshot(engine, deadline, risk, season):
+    payload = recommend_team(engine, deadline, season, risk)
+    with span('serialize'):
+        return Snapshot(payload)
+
+
+def get_recommend_snapshot(engine=None, deadline=None, risk=None, season=CURRENT_SEASON):
+    """The rendered /recommend-team payload, built once per set of parameters and data version."""
+    signature = season_signature(season)
+    return snapshot_cache.get_or_build(('recommend-team', season, engine, deadline, risk), signature,
+                                       lambda: build_recommend_snapshot(engine, deadline, risk, season))
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+from django.conf import settings
+
+# Modules whose import dominates a cold start
+HEAVY_MODULES = ['pandas', 'sklearn', 'joblib', 'scipy', 'numpy']
+
+# Run in a fresh interpreter: start the WSGI app, load the URLconf, then import
+# the modules the first prediction / recommendation requests need
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+ready = time.perf_counter() - start
+loaded = sorted(name for name in {heavy} if name in sys.modules)
+start = time.perf_counter()
+import models.views, models.recomender
+first_request = time.perf_counter() - start
+print(json.dumps({{'ready_s': ready, 'heavy_loaded_at_ready': loaded, 'first_request_imports_s': first_request}}))
+'''
+
+
+def _parse_importtime(stderr):
+    """(module, self_us, cumulative_us, depth) rows from ``python -X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def import_time_report(settings_module, top=10):
+    """Cold-start report for a settings module, measured in a new interpreter.
+
+    ``ready_s`` is the time to build the WSGI application and load its URLconf.
+    ``first_request_imports_s`` is what the first request still pays when
+    views are imported lazily. ``slowest`` lists the top-level imports with
+    the largest cumulative time.
+    """
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'probe failed')
+
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    rows = _parse_importtime(result.stderr)
+    top_level = sorted((row for row in rows if row[3] == 0), key=lambda row: -row[2])
+    return {
+        'settings': settings_module,
+        'modules': len(rows),
+        **probe,
+        'slowest': [{'module': name, 'cumulative_ms': round(cumulative / 1000, 1)}
+                    for name, _, cumulative, _ in top_level[:top]],
+    }
@@ -0,0 +1,146 @@
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+# Compiled season stores live next to the raw data they are built from
+STORE_DIR = os.path.join(settings.BASE_DIR, 'data', 'compiled')
+STORE_VERSION = 2
+
+# Per-player dimension columns; everything else in the frame is per-gameweek
+PLAYER_COLUMNS = ['element_type', 'team', 'second_name', 'first_name']
+
+
+def store_path(season):
+    """Path of the compiled store file for a season."""
+    return os.path.join(STORE_DIR, f'{season}.joblib')
+
+
+def ingest_state_path(season):
+    """Path of the incremental ingest state for a season (see models/ingest.py)."""
+    return os.path.join(STORE_DIR, f'{season}.ingest.joblib')
+
+
+def source_signature(players_dir, *extra_paths):
+    """Cheap fingerprint of a season's source CSVs (file count, sizes and mtimes)."""
+    count = 0
+    total_size = 0
+    latest_mtime = 0
+    for player_folder in os.scandir(players_dir):
+        if player_folder.is_dir():
+            try:
+                stat = os.stat(os.path.join(player_folder.path, 'gw.csv'))
+            except FileNotFoundError:
+                continue
+            count += 1
+            total_size += stat.st_size
+            latest_mtime = max(latest_mtime, stat.st_mtime_ns)
+
+    signature = (count, total_size, latest_mtime)
+    for path in extra_paths:
+        stat = os.stat(path)
+        signature += (stat.st_size, stat.st_mtime_ns)
+    return signature
+
+
+def downcast_columns(frame, dtypes):
+    """Narrow integer columns to the given dtypes, skipping any whose values would not fit."""
+    for col, dtype in dtypes.items():
+        if col not in frame.columns or frame[col].dtype.kind not in 'iu' or frame[col].dtype == dtype:
+            continue
+        info = np.iinfo(dtype)
+        values = frame[col].to_numpy()
+        if values.size == 0 or (values.min() >= info.min and values.max() <= info.max):
+            frame[col] = values.astype(dtype)
+    return frame
+
+
+def frame_memory(frame):
+    """Deep memory footprint of a DataFrame in bytes."""
+    return int(frame.memory_usage(deep=True).sum())
+
+
+def _compact_array(series):
+    """Convert a column to a typed array, narrowing integers to int32 where they fit.
+
+    Categorical columns are stored as their codes (see _categories).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy()
+    values = series.to_numpy()
+    if values.dtype.kind in 'iu':
+        info = np.iinfo(np.int32)
+        if values.size == 0 or (values.min() >= info.min and values.max() <= info.max):
+            return values.astype(np.int32)
+    return values
+
+
+def save_season_store(all_data_df, path, signature=None):
+    """Write a merged season frame (as returned by load_player_data) to a columnar store.
+
+    Gameweek columns are stored as one typed array each and the per-player
+    details are kept once per player instead of being repeated on every row.
+    """
+    gameweek_columns = [col for col in all_data_df.columns if col not in PLAYER_COLUMNS]
+    player_columns = [col for col in PLAYER_COLUMNS if col in all_data_df.columns]
+
+    players = all_data_df[['id'] + player_columns].drop_duplicates('id').sort_values('id')
+    store = {
+        'version': STORE_VERSION,
+        'signature': signature,
+        'columns': list(all_data_df.columns),
+        'dtypes': {col: str(all_data_df[col].dtype) for col in all_data_df.columns},
+        'categories': _categories(all_data_df),
+        'gameweeks': {col: _compact_array(all_data_df[col]) for col in gameweek_columns},
+        'players': {col: _compact_array(players[col]) for col in ['id'] + player_columns},
+    }
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    # Uncompressed so numeric arrays can be memory-mapped on load
+    joblib.dump(store, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _categories(frame):
+    """Categories of each categorical column, so codes can be turned back into values."""
+    return {col: (frame[col].cat.categories.tolist(), frame[col].cat.ordered)
+            for col in frame.columns if isinstance(frame[col].dtype, pd.CategoricalDtype)}
+
+
+def load_season_store(path, signature=None):
+    """Load a compiled season store back into the load_player_data frame layout.
+
+    Returns None when the store is missing, was written by another store
+    version, or was compiled from sources that no longer match ``signature``.
+    """
+    if not os.path.exists(path):
+        return None
+
+    store = joblib.load(path, mmap_mode='r')
+    if store.get('version') != STORE_VERSION:
+        return None
+    if signature is not None and store.get('signature') != tuple(signature):
+        return None
+
+    gameweeks = store['gameweeks']
+    players = store['players']
+    player_ids = np.asarray(players['id'])
+    rows = np.searchsorted(player_ids, np.asarray(gameweeks['id']))
+
+    columns = {}
+    for col in store['columns']:
+        if col in gameweeks:
+            values = np.asarray(gameweeks[col])
+        else:
+            values = np.asarray(players[col])[rows]
+        if col in store['categories']:
+            categories, ordered = store['categories'][col]
+            columns[col] = pd.Series(pd.Categorical.from_codes(
+                values, dtype=pd.CategoricalDtype(categories, ordered)))
+        else:
+            columns[col] = pd.Series(values).astype(store['dtypes'][col], copy=False)
+
+    return pd.DataFrame(columns)
@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from models.benchmarks import write_synthetic_season
+from models.optimizer import optimize_team
+from models.recomender import TEAM_STRUCTURE, load_player_data, prepare_latest_data
+
+
+class ExactEnginesTest(SimpleTestCase):
+    """branch_and_bound and milp must agree on the optimal squad's points."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with tempfile.TemporaryDirectory() as root:
+            write_synthetic_season(root, players=150, gameweeks=8, seed=1)
+            all_data = load_player_data(os.path.join(root, 'players'), os.path.join(root, 'players_raw.csv'))
+        cls.players = prepare_latest_data(all_data)
+
+    def test_same_objective_across_budgets_and_caps(self):
+        squad_size = sum(TEAM_STRUCTURE.values())
+        for max_spend in (800, 900, 1000, 1100):
+            for max_players_per_team in (1, 2, 3):
+                with self.subTest(max_spend=max_spend, max_players_per_team=max_players_per_team):
+                    bnb_team, bnb = optimize_team(self.players, TEAM_STRUCTURE, max_players_per_team, max_spend,
+                                                  'branch_and_bound')
+                    milp_team, milp = optimize_team(self.players, TEAM_STRUCTURE, max_players_per_team, max_spend,
+                                                    'milp')
+                    self.assertTrue(bnb['optimal'])
+                    self.assertTrue(milp['optimal'])
+                    self.assertEqual(len(bnb_team), squad_size)
+                    self.assertEqual(len(milp_team), squad_size)
+                    self.assertAlmostEqual(bnb['objective'], milp['objective'], places=2)
+                    self.assertLessEqual(bnb_team['value'].sum(), max_spend)
+                    self.assertLessEqual(bnb_team['team'].value_counts().max(), max_players_per_team)
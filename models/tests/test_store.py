@@ -0,0 +1,52 @@
+import os
+import tempfile
+
+import pandas as pd
+from django.test import SimpleTestCase
+
+from models.benchmarks import write_synthetic_season
+from models.optimizer import optimize_team
+from models.recomender import (MAX_PLAYERS_PER_TEAM, MAX_SPEND, TEAM_STRUCTURE, clean_column_names,
+                               load_player_data, prepare_latest_data, select_best_team)
+from models.store import load_season_store, save_season_store, source_signature
+
+
+class CompiledStoreTest(SimpleTestCase):
+    """A season loaded from the compiled store must be identical to one crawled from the CSVs."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.TemporaryDirectory()
+        root = cls.directory.name
+        write_synthetic_season(root, players=80, gameweeks=10, seed=3)
+        players_dir = os.path.join(root, 'players')
+        raw_data_path = os.path.join(root, 'players_raw.csv')
+        cls.signature = source_signature(players_dir, raw_data_path, os.path.join(root, 'teams.csv'))
+        cls.from_csv = load_player_data(players_dir, raw_data_path)
+        cls.path = save_season_store(cls.from_csv, os.path.join(root, 'compiled', 'season.joblib'), cls.signature)
+        cls.from_store = load_season_store(cls.path, cls.signature)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def test_merged_frame_is_identical(self):
+        pd.testing.assert_frame_equal(self.from_store, self.from_csv)
+
+    def test_prepared_outputs_are_identical(self):
+        from_csv = prepare_latest_data(self.from_csv)
+        from_store = prepare_latest_data(self.from_store)
+        pd.testing.assert_frame_equal(from_store, from_csv)
+
+        team_from_csv = select_best_team(TEAM_STRUCTURE, MAX_PLAYERS_PER_TEAM, MAX_SPEND, from_csv)
+        team_from_store = select_best_team(TEAM_STRUCTURE, MAX_PLAYERS_PER_TEAM, MAX_SPEND, from_store)
+        pd.testing.assert_frame_equal(clean_column_names(team_from_store), clean_column_names(team_from_csv))
+
+        milp_from_csv, _ = optimize_team(from_csv, TEAM_STRUCTURE, MAX_PLAYERS_PER_TEAM, MAX_SPEND, 'milp')
+        milp_from_store, _ = optimize_team(from_store, TEAM_STRUCTURE, MAX_PLAYERS_PER_TEAM, MAX_SPEND, 'milp')
+        self.assertEqual(milp_from_store['id'].tolist(), milp_from_csv['id'].tolist())
+
+    def test_stale_store_is_ignored(self):
+        self.assertIsNone(load_season_store(self.path, self.signature[:-1] + (self.signature[-1] + 1,)))
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+
+from .history import HISTORY_DIR, POSITIONS, history_seasons
+from .registry import ARTIFACTS, MODELS_DIR
+from .store import STORE_DIR
+from .views import expected_features
+
+# Inputs of the served rating model (price only enters the normalization)
+FEATURES = [feature for feature in expected_features if feature != 'price']
+POSITION_IDS = {'GK': 1, 'DEF': 2, 'MID': 3, 'FWD': 4}
+
+# Registry artifact each estimator is written as
+ESTIMATOR_ARTIFACTS = {'linear': 'rating_model', 'forest': 'rating_forest'}
+
+VERSIONS_DIR = os.path.join(MODELS_DIR, 'versions')
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+
+def normalize_ratings_by_position(points, costs, positions):
+    """Vectorized normalize_ratings_by_position_train from ratings.ipynb.
+
+    Points are scaled to 50-100 within each position and blended 65/35 with
+    the same score divided by the player's share of the position's top price.
+    Returns the integer ratings and {position: (min_points, max_points)}.
+    """
+    frame = pd.DataFrame({'points': points, 'cost': costs, 'position': positions})
+    by_position = frame.groupby('position')
+    min_points = by_position['points'].transform('min')
+    max_points = by_position['points'].transform('max')
+    max_cost = by_position['cost'].transform('max')
+
+    spread = (frame['points'] - min_points) / (max_points - min_points).replace(0, np.nan)
+    spread = spread.fillna(0) * 50
+    performance_rating = 50 + spread
+    price_adjustment = 50 + spread / (frame['cost'] / max_cost)
+    ratings = np.round(0.65 * performance_rating + 0.35 * price_adjustment).astype(int)
+
+    min_max = by_position['points'].agg(['min', 'max'])
+    min_max_points = {int(position): (float(row['min']), float(row['max'])) for position, row in min_max.iterrows()}
+    return ratings.to_numpy(), min_max_points
+
+
+def training_signature(seasons, history_dir=None):
+    """Hash of the training inputs: feature list and each season file's size and mtime."""
+    history_dir = history_dir or HISTORY_DIR
+    digest = hashlib.sha1(json.dumps(FEATURES).encode())
+    for season in seasons:
+        stat = os.stat(os.path.join(history_dir, f'players_{season}.csv'))
+        digest.update(f'{season}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return digest.hexdigest()[:12]
+
+
+def build_training_set(seasons, history_dir=None):
+    """Feature matrix, ratings and positions from the local players_<season>.csv files.
+
+    Features a season does not have (saves before 2023-24) are filled with the
+    mean for the player's position over the seasons that do.
+    """
+    history_dir = history_dir or HISTORY_DIR
+    frames = []
+    for season in seasons:
+        players = pd.read_csv(os.path.join(history_dir, f'players_{season}.csv'))
+        players = players.reindex(columns=FEATURES + ['position', 'now_cost', 'total_points'])
+        frames.append(players)
+    data = pd.concat(frames, ignore_index=True)
+    data['element_type'] = data['position'].replace(POSITIONS).map(POSITION_IDS)
+    data = data.dropna(subset=['element_type', 'now_cost', 'total_points'])
+
+    features = data[FEATURES].astype(np.float64)
+    features = features.fillna(features.groupby(data['element_type']).transform('mean'))
+    features = features.fillna(features.mean()).fillna(0)
+
+    ratings, min_max_points = normalize_ratings_by_position(
+        data['total_points'].to_numpy(np.float64), data['now_cost'].to_numpy(np.float64),
+        data['element_type'].to_numpy())
+    return {
+        'features': features.reset_index(drop=True),
+        'ratings': ratings,
+        'element_types': data['element_type'].to_numpy(np.int64),
+        'min_max_points': min_max_points,
+    }
+
+
+def load_training_set(seasons, use_cache=True, history_dir=None):
+    """Training set for ``seasons``, reused from the feature cache while the source files are unchanged."""
+    signature = training_signature(seasons, history_dir)
+    path = os.path.join(STORE_DIR, f'training-{signature}.joblib')
+    if use_cache and os.path.exists(path):
+        return joblib.load(path), signature, True
+
+    training_set = build_training_set(seasons, history_dir)
+    os.makedirs(STORE_DIR, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    joblib.dump(training_set, tmp_path)
+    os.replace(tmp_path, path)
+    return training_set, signature, False
+
+
+def make_estimator(name, n_jobs=-1, trees=300):
+    if name == 'linear':
+        return LinearRegression(n_jobs=n_jobs)
+    if name == 'forest':
+        return RandomForestRegressor(n_estimators=trees, n_jobs=n_jobs, random_state=RANDOM_STATE)
+    raise ValueError(f'estimator must be one of {list(ESTIMATOR_ARTIFACTS)}')
+
+
+def evaluate(model, features, ratings):
+    predicted = np.round(model.predict(features)).astype(int)
+    return {
+        'mae': round(float(mean_absolute_error(ratings, predicted)), 4),
+        'mse': round(float(mean_squared_error(ratings, predicted)), 4),
+        'r2': round(float(r2_score(ratings, predicted)), 4),
+    }
+
+
+def write_evaluation(metrics, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"Mean Absolute Error (MAE): {metrics['mae']:.2f}\n")
+        f.write(f"Mean Squared Error (MSE): {metrics['mse']:.2f}\n")
+        f.write(f"R-squared (R²): {metrics['r2']:.2f}\n")
+
+
+def train_rating_model(seasons=None, estimator='linear', n_jobs=-1, trees=300, use_cache=True, promote=True):
+    """Train a rating model from the local season files and write a versioned set of artifacts.
+
+    Artifacts go to trained_models/versions/<version>/ under the registry file
+    names, with model_evaluation.txt and manifest.json. With ``promote`` they
+    are also copied over the files the registry serves.
+    """
+    seasons = seasons or history_seasons()
+    timings = {}
+
+    start = time.perf_counter()
+    training_set, signature, cached = load_training_set(seasons, use_cache)
+    timings['features_ms'] = round((time.perf_counter() - start) * 1000, 1)
+
+    x_train, x_test, y_train, y_test = train_test_split(
+        training_set['features'], training_set['ratings'], test_size=TEST_SIZE, random_state=RANDOM_STATE)
+    model = make_estimator(estimator, n_jobs, trees)
+    start = time.perf_counter()
+    model.fit(x_train, y_train)
+    timings['fit_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    metrics = evaluate(model, x_test, y_test)
+
+    version = f'{time.strftime("%Y%m%d-%H%M%S")}-{estimator}-{signature}'
+    version_dir = os.path.join(VERSIONS_DIR, version)
+    os.makedirs(version_dir, exist_ok=True)
+    artifact = ESTIMATOR_ARTIFACTS[estimator]
+    files = {artifact: ARTIFACTS[artifact], 'min_max_points': ARTIFACTS['min_max_points']}
+    joblib.dump(model, os.path.join(version_dir, files[artifact]))
+    joblib.dump(training_set['min_max_points'], os.path.join(version_dir, files['min_max_points']))
+    write_evaluation(metrics, os.path.join(version_dir, 'model_evaluation.txt'))
+
+    manifest = {
+        'version': version,
+        'estimator': estimator,
+        'seasons': seasons,
+        'features': FEATURES,
+        'rows': len(training_set['ratings']),
+        'feature_cache_hit': cached,
+        'metrics': metrics,
+        'timings': timings,
+        'files': files,
+    }
+    with open(os.path.join(version_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    if promote:
+        for name in list(files.values()) + ['model_evaluation.txt']:
+            tmp_path = os.path.join(MODELS_DIR, f'{name}.tmp')
+            shutil.copyfile(os.path.join(version_dir, name), tmp_path)
+            os.replace(tmp_path, os.path.join(MODELS_DIR, name))
+    manifest['path'] = version_dir
+    return manifest
@@ -1,14 +1,16 @@
-import joblib
 import numpy as np
+import pandas as pd
 from django.http import JsonResponse
 import json
-import os
+import logging
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-model_path = os.path.join(BASE_DIR, 'trained_models', 'fpl_linear_model.pkl')
+from .metrics import record_rows, span
+from .registry import get_artifact, registry
+from .scoring import score_points
 
-# Load the trained model
-model = joblib.load(model_path)
+logger = logging.getLogger(__name__)
+
+# The trained model is loaded lazily by the registry on the first prediction
 
 # List of expected features for input
 expected_features = [
@@ -24,25 +26,19 @@ max_price_by_position = {
     4: 15.3   # Forward
 }
 
+# Largest batch accepted by predict_ratings_batch
+MAX_BATCH_SIZE = 5000
+
 def calculate_points(data):
-    points = 0
-    points += data['minutes'] // 60
-    if data['element_type'] == 1:  # Goalkeeper
-        points += (6 * data['goals_scored']) + (4 * data['clean_sheets']) + (data['saves'] // 3)
-    elif data['element_type'] == 2:  # Defender
-        points += (6 * data['goals_scored']) + (4 * data['clean_sheets'])
-    elif data['element_type'] == 3:  # Midfielder
-        points += (5 * data['goals_scored']) + (3 * data['assists']) + (1 * data['clean_sheets'])
-    elif data['element_type'] == 4:  # Forward
-        points += (4 * data['goals_scored']) + (3 * data['assists'])
-    points += data['assists'] + data['bonus'] - data['yellow_cards'] - (2 * data['red_cards'])
-    return points
+    """Points for one player's stats dict; see scoring.score_points for whole frames."""
+    return score_points({key: [value] for key, value in data.items()})[0].item()
 
 def predict_rating(request):
     if request.method == 'POST':
         try:
             # Parse the JSON input from the request body
-            data = json.loads(request.body)
+            with span('parse'):
+                data = json.loads(request.body)
             print(data)
             # Ensure that the request contains the expected features
             if all(feature in data for feature in expected_features):
@@ -50,7 +46,8 @@ def predict_rating(request):
                 input_data = np.array([[data[feature] for feature in expected_features if feature != 'price']])
                 
                 # Predict rating using the trained model
-                predicted_rating = model.predict(input_data)[0]
+                with span('predict'):
+                    predicted_rating = get_artifact('rating_model').predict(input_data)[0]
 
                 # Round up to the nearest integer
                 predicted_rating = int(np.ceil(predicted_rating))
@@ -67,7 +64,8 @@ def predict_rating(request):
                     normalized_rating = predicted_rating  # Fallback if element_type is invalid
                 
                 # Return the normalized prediction result as a JSON response
-                return JsonResponse({'predicted_rating': round(normalized_rating, 2)}, status=200)
+                with span('serialize'):
+                    return JsonResponse({'predicted_rating': round(normalized_rating, 2)}, status=200)
 
             else:
                 return JsonResponse({'error': 'Missing required input features'}, status=400)
@@ -75,6 +73,116 @@ def predict_rating(request):
         except json.JSONDecodeError:
             return JsonResponse({'error': 'Invalid JSON format'}, status=400)
         except Exception as e:
+            logger.exception('predict-rating failed')
             return JsonResponse({'error': str(e)}, status=500)
 
     return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
+
+
+def predict_normalized_ratings(features, element_types, prices):
+    """Vectorized predict_rating: one model call, then the per-position price normalization.
+
+    ``features`` is a DataFrame holding the model input columns, ``element_types``
+    the positions (1-4) and ``prices`` the prices in millions.
+    """
+    input_data = features[[feature for feature in expected_features if feature != 'price']].to_numpy(np.float64)
+    predicted = np.ceil(get_artifact('rating_model').predict(input_data)).astype(int)
+
+    # Unknown positions fall back to the raw rating
+    max_price = pd.Series(element_types).map(max_price_by_position).to_numpy(np.float64)
+    price = np.asarray(prices, dtype=np.float64)
+    return np.where(np.isnan(max_price), predicted,
+                    predicted * 0.9 + 0.1 * predicted * (max_price / price))
+
+
+def rate_players(players):
+    """Predict normalized ratings for a list of player dicts with one model call.
+
+    Returns one result per input, either ``{'predicted_rating': ...}`` or
+    ``{'error': ...}``, so a bad item never fails the rest of the batch.
+    """
+    results = [None] * len(players)
+    required = expected_features + ['element_type']
+
+    valid_positions = []
+    for i, player in enumerate(players):
+        if not isinstance(player, dict):
+            results[i] = {'error': 'Each player must be a JSON object'}
+            continue
+        missing = [feature for feature in required if feature not in player]
+        if missing:
+            results[i] = {'error': f'Missing required input features: {", ".join(missing)}'}
+            continue
+        valid_positions.append(i)
+
+    if not valid_positions:
+        return results
+
+    # Validate every feature column in one pass
+    frame = pd.DataFrame([players[i] for i in valid_positions], columns=required)
+    numeric = frame[expected_features].apply(pd.to_numeric, errors='coerce')
+    invalid = numeric.isna()
+    bad_price = (numeric['price'] <= 0) & frame['element_type'].isin(max_price_by_position.keys())
+    rejected = invalid.any(axis=1) | bad_price
+
+    for row in np.flatnonzero(rejected.to_numpy()):
+        bad_columns = list(invalid.columns[invalid.iloc[row].to_numpy()])
+        message = f'Non-numeric values for: {", ".join(bad_columns)}' if bad_columns else 'price must be positive'
+        results[valid_positions[row]] = {'error': message}
+
+    accepted = ~rejected.to_numpy()
+    if not accepted.any():
+        return results
+
+    numeric = numeric[accepted]
+    normalized = predict_normalized_ratings(numeric, frame['element_type'][accepted], numeric['price'])
+
+    for row, rating in zip(np.flatnonzero(accepted), normalized):
+        results[valid_positions[row]] = {'predicted_rating': round(float(rating), 2)}
+    return results
+
+
+def read_players_batch(request):
+    """Parse a batch body: a JSON array, ``{"players": [...]}``, or NDJSON (one player per line)."""
+    if request.content_type in ('application/x-ndjson', 'application/jsonl'):
+        players = []
+        for line in request:
+            line = line.strip()
+            if line:
+                players.append(json.loads(line))
+        return players
+
+    data = json.loads(request.body)
+    if isinstance(data, dict):
+        data = data.get('players')
+    if not isinstance(data, list):
+        raise ValueError('Expected a JSON array of players or {"players": [...]}')
+    return data
+
+
+def predict_ratings_batch(request):
+    if request.method == 'POST':
+        try:
+            players = read_players_batch(request)
+            if len(players) > MAX_BATCH_SIZE:
+                return JsonResponse({'error': f'Batch too large, maximum is {MAX_BATCH_SIZE} players'}, status=413)
+
+            with span('predict'):
+                results = rate_players(players)
+            record_rows('predict', len(players))
+            errors = sum(1 for result in results if 'error' in result)
+            return JsonResponse({'results': results, 'count': len(results), 'errors': errors}, status=200)
+
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON format'}, status=400)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except Exception as e:
+            logger.exception('predict-ratings/batch failed')
+            return JsonResponse({'error': str(e)}, status=500)
+
+    return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
+
+
+def model_status(request):
+    return JsonResponse({'artifacts': registry.report()})